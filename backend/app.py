@@ -5,7 +5,7 @@ import inflect
 import re
 import nltk
 from nltk.stem import WordNetLemmatizer
-from transformers import pipeline
+from summarizer import get_summarizer
 from flask_cors import CORS
 
 app = Flask(__name__)
@@ -166,7 +166,7 @@ def process_paragraph2(paragraph: str) -> list:
     ]
 
 def summarize_text(text):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    summarizer = get_summarizer()
     
     # Calculate the lengths
     text_length = len(text.split())  # Number of words in the text
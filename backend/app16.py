@@ -4,7 +4,7 @@ from spacy.matcher import Matcher
 import nltk
 from nltk.corpus import wordnet, stopwords
 from nltk.stem import WordNetLemmatizer
-from transformers import pipeline
+from summarizer import get_summarizer
 from flask_cors import CORS
 from dateparser import parse
 from datetime import datetime, timedelta
@@ -417,7 +417,7 @@ def process_paragraph(paragraph: str) -> list:
     ]
 
 def summarize_text(text):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    summarizer = get_summarizer()
     
     # Calculate the lengths
     text_length = len(text.split())  # Number of words in the text
@@ -1,212 +1,121 @@
-from flask import Flask, request, jsonify
-import spacy
-from spacy.matcher import Matcher
-import nltk
-from nltk.corpus import wordnet, stopwords
-from nltk.stem import WordNetLemmatizer
-from transformers import pipeline
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from dateparser import parse
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
 import os
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from types import SimpleNamespace
 from dateutil.parser import parse
 from dateutil.parser._parser import ParserError
-
+from dateutil.parser import parserinfo
+from calendar import monthrange
+from datetime import date
+from functools import lru_cache
+
+# Imported by an extraction pool worker (extraction_worker.py marks them), or re-run as
+# __mp_main__ by spawn in a child of `python app19.py`: load models on first use and
+# start no pools of its own. Set before model_registry reads MODEL_LOAD_MODE.
+IN_EXTRACTION_WORKER = __name__ == "__mp_main__" or os.environ.get("EXTRACTION_POOL_WORKER") == "1"
+if IN_EXTRACTION_WORKER:
+    os.environ.update(MODEL_LOAD_MODE="lazy", SUMMARIZER_WORKERS="0", EXTRACTION_WORKERS="0")
+
+from model_registry import MODEL_LOAD_MODE, models, timed_import
+from nlp_models import SPACY_MODEL, TRAINED_MODEL_PATH, get_nlp, register_spacy_model
+from summarizer import plan_summary, stream_summary, summarize_text, summarizer_id, summary_lengths
+from summary_cache import SummaryCache, summary_cache_key
+from email_events import EXTRACTOR_VERSION, EmailEventStore, body_digest
+from event_jobs import EventJobRunner, EventJobStore
+from segmenter import segment_sentences
+from time_expressions import normalize_times
+from date_resolver import resolve_date
+import extraction_worker
+
+
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)  # Allow CORS
 
-# Ensure NLTK data is downloaded
-nltk.download('stopwords')
-nltk.download('wordnet')
-
-# Load spaCy model for English
-nlp = spacy.load('en_core_web_sm')
-
-# Initialize the NLTK WordNetLemmatizer
-lemmatizer = WordNetLemmatizer()
-
-# Define a list of priority words and their corresponding noun forms
-priority_words = {
-    "meet": "meeting",
-    "submit": "submission",
-    "present": "presentation",
-    "deadline": "deadline",
-    "plan": "planning",
-    "report": "report",
-    "discuss": "discussion",
-    "call": "call",
-    "sync": "sync",
-    "launch": "launch",
-    "lecture": "lecture",
-    "class": "class",
-    "session": "session",
-    "break":"break",
-    "workshop":"workshop"
-}
-
-# Initialize Matcher
-matcher = Matcher(nlp.vocab)
-
-# Define patterns for event-related phrases
-event_patterns = [
-    [{"POS": "NOUN"}, {"POS": "NOUN", "OP": "?"}],  # Noun + Optional Noun
-    [{"POS": "ADJ"}, {"POS": "NOUN"}],              # Adjective + Noun
-    [{"POS": "VERB"}, {"POS": "NOUN", "OP": "?"}],  # Verb + Optional Noun
-    [{"POS": "VERB"}, {"POS": "ADP", "OP": "?"}, {"POS": "NOUN"}],  # Verb + Optional Preposition + Noun
-    [{"POS": "NOUN"}, {"POS": "ADP"}, {"POS": "NOUN"}]  # Noun + Preposition + Noun
-]
-matcher.add("EVENT_PATTERN", event_patterns)
-
-def convert_time_phrases(time_string):
-    """
-    Convert standard times (e.g., '2:30 pm') and natural language time phrases (e.g., 'half past 3 pm') to 24-hour format.
-    """
-    time_string = time_string.lower().strip()
-
-    # Match standard time formats (e.g., '2:30 pm', '12:15 am')
-    standard_time_match = re.match(r"(\d{1,2}):(\d{2})\s*(am|pm)?", time_string)
-    if standard_time_match:
-        hour = int(standard_time_match.group(1))
-        minute = int(standard_time_match.group(2))
-        period = standard_time_match.group(3)
-
-        # Convert to 24-hour format
-        if period == "pm" and hour != 12:
-            hour += 12
-        elif period == "am" and hour == 12:
-            hour = 0
-
-        return f"{hour:02d}:{minute:02d}"
-
-    # Match phrases like 'half past 3 pm', 'quarter to 4 am'
-    phrase_match = re.search(r"(half past|quarter past|quarter to|o'clock)?\s*(\d{1,2})\s*(am|pm)?", time_string)
-    if phrase_match:
-        phrase = phrase_match.group(1)
-        hour = int(phrase_match.group(2))
-        period = phrase_match.group(3)
-
-        # Initialize minutes
-        minutes = 0
-
-        # Handle phrases
-        if phrase == "half past":
-            minutes = 30
-        elif phrase == "quarter past":
-            minutes = 15
-        elif phrase == "quarter to":
-            hour -= 1
-            if hour < 1:
-                hour = 12  # Wrap around midnight/midday
-            minutes = 45
-        elif phrase == "o'clock":
-            minutes = 0
-
-        # Convert to 24-hour format
-        if period == "pm" and hour != 12:
-            hour += 12
-        elif period == "am" and hour == 12:
-            hour = 0
-
-        return f"{hour:02d}:{minutes:02d}"
-
-    # If no valid time format is found, return the original string
-    return time_string
-
-def convert_verbs_to_nouns(text):
-    """ Convert verbs to nouns and prioritize certain words. """
-    doc = nlp(text)
-    nouns = [token.text for token in doc if token.pos_ == "NOUN"]
-    verbs = [token.text for token in doc if token.pos_ == "VERB"]
-
-    for word, noun_form in priority_words.items():
-        if word in text.lower():
-            return noun_form
-
-    for verb in verbs:
-        verb_base_form = lemmatizer.lemmatize(verb, 'v')
-        if verb_base_form in priority_words:
-            return priority_words[verb_base_form]
-
-    if nouns:
-        return ' '.join(nouns)
-
-    if verbs:
-        verb = verbs[0]
-        noun_form = lemmatizer.lemmatize(verb, 'n')
-        return noun_form if noun_form != verb else verb + "ing"
-
-    return text
+# Extraction engines and the spaCy model each one parses with (see EXTRACTION_ENGINES);
+# only the default engine's model is loaded at startup
+EXTRACTION_ENGINE = os.environ.get("EXTRACTION_ENGINE", "heuristic").lower()
+ENGINE_MODELS = {"heuristic": SPACY_MODEL, "trained": TRAINED_MODEL_PATH}
+if EXTRACTION_ENGINE not in ENGINE_MODELS:
+    raise ValueError(f"Unknown EXTRACTION_ENGINE '{EXTRACTION_ENGINE}', expected one of {tuple(ENGINE_MODELS)}")
+for _engine, _model in ENGINE_MODELS.items():
+    register_spacy_model(_model, eager=MODEL_LOAD_MODE == "eager" and _engine == EXTRACTION_ENGINE)
 
+# Start warming eager models (spaCy and the summarizer) without blocking startup;
+# missing resources are logged, never downloaded, and /ready reports progress
+if not IN_EXTRACTION_WORKER:
+    models.preload(background=True)
 
 days_of_week = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
 
-def get_next_monday(today):
-    """Get the Monday of next week from the given date."""
-    days_ahead = 0 - today.weekday() + 7
-    if days_ahead <= 0:
-        days_ahead += 7
-    return today + timedelta(days=days_ahead)
-
-def get_first_day_of_next_month(today):
-    """Get the first day of next month."""
-    next_month = today.month % 12 + 1
-    next_year = today.year + (today.month // 12)
-    return datetime(next_year, next_month, 1)
-
-def get_next_day_by_name(today, day_name):
-    """Get the next specific day from the current date."""
-    target_day = days_of_week.index(day_name.lower())
-    if target_day is None:
-        return None
-    days_ahead = target_day - today.weekday()
-    if days_ahead <= 0:
-        days_ahead += 7
-    return today + timedelta(days=days_ahead)
-
-def extract_event_details(sentence, current_date=None):
-    """Extract event details from the sentence."""
-    doc = nlp(sentence)
-    dates = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
-    today = datetime.today()
-    formatted_dates = []
-
-
-
-
 def remove_am_pm(event_text):
     """Remove 'am' and 'pm' from the event text."""
     return event_text.replace(" am", "").replace(" pm", "")
 
 
-# Load spaCy English model
-nlp = spacy.load("en_core_web_sm")
 # List of priority words to consider
 priority_words = {"meeting", "conference", "call", "interview", "review", "session", "discussion", "presentation", "lecture"}
 
 # List of time indicators and days of the week to exclude
 time_indicators = {"am", "pm", "afternoon","evening","morning","night"}
 
+# spaCy work done while serving the current request: the number of texts parsed
+# (X-Spacy-Parses header) and seconds spent per pipeline component (Server-Timing)
+_parse_stats = threading.local()
+
+# Pipeline components each extraction stage reads from; the rest are skipped for that
+# stage. split_parts only looks at doc.ents, but NER never lets an entity cross a
+# sentence start, so it needs the parser's sentence boundaries to match a full parse.
+# analyze_segment also needs POS tags (tagger plus attribute_ruler). Nothing reads lemmas.
+PIPELINE_PROFILES = {
+    "entities": {"parser", "ner"},
+    "analysis": {"tagger", "parser", "attribute_ruler", "ner"},
+}
+# SPACY_PROFILES=0 runs the whole pipeline at every stage, for comparing timings
+SPACY_PROFILES = os.environ.get("SPACY_PROFILES", "1") != "0"
 
-import re
 
-def split_sentences(sentence: str) -> list:
-    """Split a sentence by commas or 'and' only if multiple twings are present."""
-    # Parse the sentence using spaCy to extract entities
-    doc = nlp(sentence)
-    print("working3")
-    # Find all time entities
-    times = [ent.text for ent in doc.ents if ent.label_ == "TwE"]
+def engine_nlp(engine=None):
+    """The spaCy pipeline the extraction engine parses with (EXTRACTION_ENGINE by default)."""
+    return get_nlp(ENGINE_MODELS[engine or EXTRACTION_ENGINE])
 
-    # If there are multiple time entities, split the sentence
-    if len(times) > 1:
-        print("working3.1")
-        parts = re.split(r',|\band\b', sentence)
-        return [part.strip() for part in parts if part.strip()]
-    print("working3.2")
-    # If only one or no time found, return the sentence as a single item list
-    return [sentence.strip()]
+
+def profile_components(profile, engine=None):
+    """Names of the components `profile` runs on the engine's pipeline, in pipeline order.
+
+    A shared tok2vec is included whenever one of the chosen components listens to it.
+    """
+    nlp = engine_nlp(engine)
+    if not SPACY_PROFILES:
+        return list(nlp.pipe_names)
+    wanted = PIPELINE_PROFILES[profile]
+    return [
+        name for name, component in nlp.pipeline
+        if name in wanted or wanted & set(getattr(component, "listening_components", ()))
+    ]
+
+
+def _record_timing(name, seconds):
+    timings = getattr(_parse_stats, "timings", None)
+    if timings is None:
+        timings = _parse_stats.timings = {}
+    timings[name] = timings.get(name, 0.0) + seconds
+
+
+def parse_text(text, profile="analysis", engine=None):
+    """Parse `text` with the components `profile` needs, counting the parse against the current request."""
+    return parse_texts([text], profile, n_process=1, engine=engine)[0]
 
 
 def is_date(text):
@@ -218,168 +127,227 @@ def is_date(text):
     except ParserError:
         return False
 
-def get_main_part(sentence):
-    # Process the sentence with spaCy
-    doc = nlp(sentence)
-    # Initialize an empty list and set to hold the main part
-    main_part = []
-    unique_words = set()
-    date_tokens = set()
-    print("working4")
-    # Identify and store any tokens that are dates
-    for token in doc:
-        # If the token or token+next word represents a date, add to date_tokens
-        if is_date(token.text):
-            date_tokens.add(token.text)
-        elif token.i + 1 < len(doc) and is_date(f"{token.text} {doc[token.i + 1].text}"):
-            date_tokens.add(f"{token.text} {doc[token.i + 1].text}")
-
-    # First, check for adjacent adjective + noun, noun + noun, noun + priority word, or priority word + noun
-    for token in doc:
-        # Skip time indicators, days of the week, and tokens identified as dates
-        if token.text.lower() in time_indicators or token.text.lower() in days_of_week or token.text in date_tokens:
-            continue
-        
-        # Check if token is a priority word
-        if token.text.lower() in priority_words:
-            # Check for adjacent adjective + noun or noun + noun
-            next_token = token.nbor(1) if token.i + 1 < len(doc) else None
-            prev_token = token.nbor(-1) if token.i - 1 >= 0 else None
-            
-            # Adjective + priority word or priority word + adjective
-            if prev_token and prev_token.pos_ == "ADJ" and prev_token.dep_ in ("amod", "attr"):
-                main_part_combo = f"{prev_token.text} {token.text}"
-                if main_part_combo not in unique_words:
-                    main_part.append(main_part_combo)
-                    unique_words.add(main_part_combo)
-                break  # Stop once we find the first valid combination
-            
-            # Adjective + noun pattern (priority word)
-            elif next_token and next_token.pos_ == "ADJ" and next_token.dep_ in ("amod", "attr"):
-                main_part_combo = f"{token.text} {next_token.text}"
-                if main_part_combo not in unique_words:
-                    main_part.append(main_part_combo)
-                    unique_words.add(main_part_combo)
-                break
 
-            # Noun + noun pattern (priority word)
-            elif next_token and next_token.pos_ == "NOUN":
-                main_part_combo = f"{token.text} {next_token.text}"
-                if main_part_combo not in unique_words:
-                    main_part.append(main_part_combo)
-                    unique_words.add(main_part_combo)
-                break
+# Precompiled date recognizer. Same answers as is_date, but decides the common
+# cases (ordinary words, punctuation, plain numbers, ordinals, HH:MM) from
+# dateutil's own vocabulary without raising and catching ParserError per token.
+_date_info = parserinfo()
+_MONTH_NAMES = {name.lower() for names in _date_info.MONTHS for name in names}
+_WEEKDAY_NAMES = {name.lower() for names in _date_info.WEEKDAYS for name in names}
+# Words dateutil skips over; alone they carry no date
+_JUMP_WORDS = {word for word in _date_info.JUMP if word.isalpha()}
+_DATE_VOCABULARY = _MONTH_NAMES | _WEEKDAY_NAMES | _JUMP_WORDS
+# Alphabetic strings Python's float() accepts, which dateutil treats as numbers
+_FLOAT_WORDS = {"nan", "inf", "infinity"}
 
-            # Priority word + noun (adjacent)
-            elif prev_token and prev_token.pos_ == "NOUN":
-                main_part_combo = f"{prev_token.text} {token.text}"
-                if main_part_combo not in unique_words:
-                    main_part.append(main_part_combo)
-                    unique_words.add(main_part_combo)
-                break
+_NUMBER_PATTERN = re.compile(r"[0-9]{1,4}")
+_ORDINAL_PATTERN = re.compile(r"([0-9]{1,2})(?:st|nd|rd|th)", re.IGNORECASE)
+_CLOCK_PATTERN = re.compile(r"([0-9]{1,2}):([0-9]{2})")
 
-            # If priority word has no adj/noun combination, just add the word itself
-            elif token.text not in unique_words and len(main_part) == 0:
-                main_part.append(token.text)
-                unique_words.add(token.text)
-                break
-    
-    # If no priority word with adjacent combinations is found, check for non-adjacent nouns
-    if not main_part:
-        for token in doc:
-            # Skip time indicators, days of the week, and date tokens
-            if token.text.lower() in time_indicators or token.text.lower() in days_of_week or token.text in date_tokens:
-                continue
-            
-            # Add noun alone to the main part, but only if adjacent numbers are allowed
-            if token.pos_ == "NOUN" and token.text not in unique_words:
-                # Check if an adjacent number (like "5th") exists
-                prev_token = token.nbor(-1) if token.i - 1 >= 0 else None
-                next_token = token.nbor(1) if token.i + 1 < len(doc) else None
-                
-                if prev_token and prev_token.like_num:
-                    main_part_combo = f"{prev_token.text} {token.text}"
-                    if main_part_combo not in unique_words:
-                        main_part.append(main_part_combo)
-                        unique_words.add(main_part_combo)
-                elif next_token and next_token.like_num:
-                    main_part_combo = f"{token.text} {next_token.text}"
-                    if main_part_combo not in unique_words:
-                        main_part.append(main_part_combo)
-                        unique_words.add(main_part_combo)
-                else:
-                    main_part.append(token.text)
-                    unique_words.add(token.text)
-                
-            # Stop if we've found up to five words
+
+@lru_cache(maxsize=4096)
+def _is_date_memo(text, today):
+    """Bounded memo over is_date for the rare shapes the patterns do not decide.
+
+    Numeric parses fill in missing fields from today's date, so the day is part of the key.
+    """
+    return is_date(text)
+
+
+def _day_number_is_date(value, today):
+    # A bare day number has to exist in the current month; 32 and up read as a year
+    if value == 0:
+        return False
+    return value <= monthrange(today.year, today.month)[1] or value > 31
+
+
+def looks_like_date(text):
+    """Check whether `text` parses as a date, with the same answers as is_date."""
+    words = text.split()
+    if not words:
+        return False
+
+    lowered = [word.lower() for word in words]
+    if all(word.isalpha() for word in words) and not any(word in _FLOAT_WORDS for word in lowered):
+        # Only month and weekday names carry a date; a second month name is a parse error
+        if any(word not in _DATE_VOCABULARY for word in lowered):
+            return False
+        months = sum(word in _MONTH_NAMES for word in lowered)
+        return months == 1 or (months == 0 and any(word in _WEEKDAY_NAMES for word in lowered))
+
+    if not any(character.isalnum() for character in text):
+        return False  # Punctuation alone never sets a date field
+
+    today = date.today()
+    if len(words) == 1:
+        if _NUMBER_PATTERN.fullmatch(text):
+            value = int(text)
+            # One or two digits are a day of the month; three or four are a year
+            return _day_number_is_date(value, today) if len(text) <= 2 else value > 0
+        ordinal = _ORDINAL_PATTERN.fullmatch(text)
+        if ordinal:
+            return _day_number_is_date(int(ordinal.group(1)), today)
+        clock = _CLOCK_PATTERN.fullmatch(text)
+        if clock and int(clock.group(1)) < 24 and int(clock.group(2)) < 60:
+            return True
+
+    return _is_date_memo(text, today)
+
+@lru_cache(maxsize=None)
+def _main_part_tables(vocab):
+    """Per-vocabulary lookups for get_main_part: a PhraseMatcher for the priority words and attribute ids."""
+    from spacy.matcher import PhraseMatcher
+    from spacy.tokens import Doc
+
+    matcher = PhraseMatcher(vocab, attr="LOWER")
+    matcher.add("PRIORITY", [Doc(vocab, words=[word]) for word in sorted(priority_words)])
+    strings = vocab.strings
+    return SimpleNamespace(
+        matcher=matcher,
+        adj=strings["ADJ"],
+        noun=strings["NOUN"],
+        modifier_deps={strings["amod"], strings["attr"]},
+        skipped_lowers={strings[word] for word in time_indicators | set(days_of_week)},
+    )
+
+
+def get_main_part(doc):
+    """Pick the words naming the event from an already parsed segment.
+
+    The first priority word (one not part of a date or time) is named with the adjective
+    or noun next to it. Without one, up to five nouns are taken, each with an adjacent
+    number ("room 5"). Token attributes are read once through doc.to_array.
+    """
+    from spacy.attrs import DEP, LIKE_NUM, LOWER, POS
+
+    tables = _main_part_tables(doc.vocab)
+    attributes = doc.to_array([POS, DEP, LOWER, LIKE_NUM]).tolist()
+    texts = [token.text for token in doc]
+    last = len(texts) - 1
+
+    def skipped(i):
+        # Time indicators, days of the week and tokens that parse as dates never name the event
+        return attributes[i][2] in tables.skipped_lowers or looks_like_date(texts[i])
+
+    def modifies(i):
+        pos, dep = attributes[i][:2]
+        return pos == tables.adj and dep in tables.modifier_deps
+
+    # The first priority word, with an adjacent adjective or noun when there is one
+    for _, i, _ in tables.matcher(doc):
+        if skipped(i):
+            continue
+        if i > 0 and modifies(i - 1):
+            return f"{texts[i - 1]} {texts[i]}"
+        if i < last and (modifies(i + 1) or attributes[i + 1][0] == tables.noun):
+            return f"{texts[i]} {texts[i + 1]}"
+        if i > 0 and attributes[i - 1][0] == tables.noun:
+            return f"{texts[i - 1]} {texts[i]}"
+        return texts[i]
+
+    # Otherwise up to five nouns, each joined to an adjacent number
+    main_part = []
+    unique_words = set()
+    for i, (pos, _, _, _) in enumerate(attributes):
+        if pos != tables.noun or texts[i] in unique_words or skipped(i):
+            continue
+        if i > 0 and attributes[i - 1][3]:
+            words = f"{texts[i - 1]} {texts[i]}"
+        elif i < last and attributes[i + 1][3]:
+            words = f"{texts[i]} {texts[i + 1]}"
+        else:
+            words = texts[i]
+        if words not in unique_words:
+            main_part.append(words)
+            unique_words.add(words)
             if len(main_part) >= 5:
                 break
-    
-    # Return the combined main part (adj + noun or noun + noun) with a max of five words
+
     return " ".join(main_part) if main_part else None
 
-def split_sentences(sentence: str) -> list:
-    """Split a sentence by commas or 'and' only if multiple twings are present."""
-    # Parse the sentence using spaCy to extract entities
-    doc = nlp(sentence)
-    
+def split_parts(doc):
+    """Return the pieces a parsed sentence splits into, or None if it stays whole.
+
+    Split by commas or 'and' only if multiple twings are present.
+    """
     # Find all time entities
     times = [ent.text for ent in doc.ents if ent.label_ == "TwE"]
 
     # If there are multiple time entities, split the sentence
     if len(times) > 1:
-        parts = re.split(r',|\band\b', sentence)
+        parts = re.split(r',|\band\b', doc.text)
         return [part.strip() for part in parts if part.strip()]
-    
-    # If only one or no time found, return the sentence as a single item list
-    return [sentence.strip()]
+    return None
+
+def split_sentences(doc, engine=None) -> list:
+    """Split a parsed sentence into parsed segments; only new pieces need parsing."""
+    parts = split_parts(doc)
+    if parts is None:
+        # If only one or no time found, the sentence's own parse is the single segment
+        return [doc]
+    return [parse_text(part, engine=engine) for part in parts]
+
+def get_event_entity(doc):
+    """Name the event after the trained model's EVENT entity, or the whole segment without one."""
+    events = [ent.text for ent in doc.ents if ent.label_ == "EVENT"]
+    return events[-1] if events else doc.text
+
+# How each extraction engine names the event in a parsed segment:
+#   "heuristic" - en_core_web_sm POS/dependency rules over the segment (get_main_part)
+#   "trained"   - the custom NER in trained_model/, whose EVENT entity is the event (as in app20)
+# Dates and times come from DATE/TIME entities either way.
+EXTRACTION_ENGINES = {
+    "heuristic": get_main_part,
+    "trained": get_event_entity,
+}
+
+def analyze_segment(doc, engine=None, today=None):
+    """Phase one: everything about a segment that does not depend on earlier segments.
 
-def extract_event_details(sentence, current_date=None):
-    """Extract event details from the sentence."""
-    doc = nlp(sentence)
+    `today` is the date relative dates resolve against; it defaults to the current date.
+    """
+    sentence = doc.text
     dates = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
     times = [ent.text for ent in doc.ents if ent.label_ == "TIME"]
-    today = datetime.today()
+    today = today or datetime.today()
     formatted_dates = []
 
     # Summarize the event
-    summarized_event = get_main_part(sentence)
+    summarized_event = EXTRACTION_ENGINES[engine or EXTRACTION_ENGINE](doc)
     summarized_event= summarized_event.capitalize()
     # Flag cancellations
     if "cancelled" in sentence.lower():
         summarized_event += ": Cancelled"
-    print("Working extract1")
-    # Process dates and add debug info
+    # Resolve dates against the reference day; repeated phrases come from the resolver's cache
     for date_str in dates:
-        parsed_date = None
-        try:
-            if "next week" in date_str.lower():
-                parsed_date = get_next_monday(today)
-            elif "next month" in date_str.lower():
-                parsed_date = get_first_day_of_next_month(today)
-            elif any(day in date_str.lower() for day in days_of_week):
-                for day_name in days_of_week:
-                    if day_name in date_str.lower():
-                        parsed_date = get_next_day_by_name(today, day_name)
-                        break
-            else:
-                parsed_date = parse(date_str, fuzzy=True)
+        parsed_date = resolve_date(date_str, today)
+        if parsed_date:
+            formatted_dates.append(parsed_date.strftime("%d-%m-%y"))
+        else:
+            logger.debug("No date found in %r", date_str)
+
+    return {
+        "event": summarized_event,
+        "dates": formatted_dates,
+        # All of the segment's TIME entities in one batch; a range contributes its start and end
+        "times": [time for span in normalize_times(times) for time in span if time],
+        "today": today.strftime("%d-%m-%y"),
+    }
 
-            # Append parsed date if valid
-            if parsed_date:
-                formatted_dates.append((date_str, parsed_date.strftime("%d-%m-%y")))
-                current_date = parsed_date.strftime("%d-%m-%y")
+def resolve_segment(segment, current_date=None):
+    """Phase two: apply the date carried over from earlier segments."""
+    summarized_event = segment["event"]
+    formatted_dates = list(segment["dates"])
+    formatted_times = segment["times"]
 
-        except Exception as e:
-            print(f"Error parsing date '{date_str}': {e}")
-
-    # Set default date if no date was found
-    if not formatted_dates:
-        current_date = current_date or today.strftime("%d-%m-%y")
-        formatted_dates.append((None, current_date))
+    if formatted_dates:
+        # The last date mentioned carries over to the following segments
+        current_date = formatted_dates[-1]
+    else:
+        # Set default date if no date was found
+        current_date = current_date or segment["today"]
+        formatted_dates.append(current_date)
 
-    # Convert time phrases
-    formatted_times = [convert_time_phrases(t) for t in times]
     # If summarized_event is "No event" and no time is present, do not return it
     if summarized_event == "No event" and not formatted_times:
         return None, current_date
@@ -391,60 +359,144 @@ def extract_event_details(sentence, current_date=None):
     # Prepare the result
     result = {
         "Event": summarized_event,
-        "Date": ', '.join([d[1] for d in formatted_dates]),
+        "Date": ', '.join(formatted_dates),
         "Time": ', '.join(formatted_times) if formatted_times else ""
     }
     
     return result, current_date
 
+def extract_event_details(doc, current_date=None, engine=None):
+    """Extract event details from a parsed segment."""
+    return resolve_segment(analyze_segment(doc, engine), current_date)
 
-def process_paragraph(paragraph: str) -> list:
-    """Process a paragraph and extract event details from each sentence."""
-    # Split paragraph by periods, and handle new lines as sentence delimiters
-    sentences = [sentence.strip() + '.' for sentence in paragraph.split('.') if sentence.strip()]
-    
-    # Initialize current_date to None for the first sentence
+
+# spaCy batching for extraction: texts per nlp.pipe batch, and worker processes
+# (n_process > 1 forks the web worker, so keep it at 1 unless extraction runs alone)
+EXTRACTION_BATCH_SIZE = int(os.environ.get("EXTRACTION_BATCH_SIZE", "64"))
+EXTRACTION_N_PROCESS = int(os.environ.get("EXTRACTION_N_PROCESS", "1"))
+# Stored emails that need extraction are spread over this many worker processes,
+# one email per task (0 or 1 extracts them in the web process)
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def load_extraction_pool():
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn rather than fork: the web process already runs model-loading and request threads
+    return ProcessPoolExecutor(
+        EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn"), initializer=extraction_worker.init_worker
+    )
+
+
+if EXTRACTION_WORKERS > 1:
+    models.register("extraction-pool", load_extraction_pool)
+
+
+def run_components(docs, names, batch_size=None, engine=None):
+    """Apply the named pipeline components to tokenised docs, in pipeline order, timing each one."""
+    docs = list(docs)
+    for name, component in engine_nlp(engine).pipeline:
+        if name not in names or not docs:
+            continue
+        started = time.perf_counter()
+        if hasattr(component, "pipe"):
+            docs = list(component.pipe(docs, batch_size=batch_size or EXTRACTION_BATCH_SIZE))
+        else:
+            docs = [component(doc) for doc in docs]
+        _record_timing(name, time.perf_counter() - started)
+    return docs
+
+
+def parse_texts(texts, profile="analysis", batch_size=None, n_process=None, engine=None):
+    """Parse many texts with the components `profile` needs, counting the parses against the current request."""
+    texts = list(texts)
+    _parse_stats.count = getattr(_parse_stats, "count", 0) + len(texts)
+    batch_size = batch_size or EXTRACTION_BATCH_SIZE
+    n_process = n_process or EXTRACTION_N_PROCESS
+    names = profile_components(profile, engine)
+    nlp = engine_nlp(engine)
+
+    started = time.perf_counter()
+    if n_process > 1:
+        # Components run inside the worker processes, so only the whole pipe can be timed
+        docs = list(nlp.pipe(
+            texts, batch_size=batch_size, n_process=n_process,
+            disable=[name for name in nlp.pipe_names if name not in names]
+        ))
+        _record_timing("pipe", time.perf_counter() - started)
+        return docs
+    docs = list(nlp.tokenizer.pipe(texts, batch_size=batch_size))
+    _record_timing("tokenizer", time.perf_counter() - started)
+    return run_components(docs, names, batch_size, engine)
+
+
+def complete_docs(docs, profile, done_profile, batch_size=None, engine=None):
+    """Run the components of `profile` that parsing with `done_profile` has not already run."""
+    done = set(profile_components(done_profile, engine))
+    names = [name for name in profile_components(profile, engine) if name not in done]
+    return run_components(docs, names, batch_size, engine)
+
+
+def analyze_sentences(sentences, batch_size=None, n_process=None, engine=None, today=None):
+    """Phase one over a whole paragraph: batched parsing plus per-segment analysis, in order."""
+    # Deciding whether a sentence splits only needs its entities
+    sentence_docs = parse_texts(sentences, "entities", batch_size, n_process, engine)
+    parts_per_sentence = [split_parts(doc) for doc in sentence_docs]
+
+    # Whole sentences get the remaining analysis components on their existing Doc;
+    # sentences that split are parsed again piecewise, all pieces in one batch
+    whole_docs = iter(complete_docs(
+        [doc for doc, parts in zip(sentence_docs, parts_per_sentence) if parts is None],
+        "analysis", "entities", batch_size, engine
+    ))
+    part_docs = iter(parse_texts(
+        [part for parts in parts_per_sentence if parts for part in parts], "analysis", batch_size, n_process, engine
+    ))
+
+    segments = []
+    for parts in parts_per_sentence:
+        if parts is None:
+            segments.append(analyze_segment(next(whole_docs), engine, today))
+        else:
+            segments.extend(analyze_segment(next(part_docs), engine, today) for _ in parts)
+    return segments
+
+
+def iter_paragraph_events(paragraph: str, batch_size=None, n_process=None, engine=None, today=None):
+    """Yield the event details of a paragraph as they are resolved, sentence by sentence.
+
+    Sentences are parsed `batch_size` at a time, so the first events come out before
+    the rest of a long paragraph has been parsed.
+    """
+    # Split into sentences without breaking times, abbreviations, URLs or addresses
+    sentences = segment_sentences(paragraph)
+    batch_size = batch_size or EXTRACTION_BATCH_SIZE
+
+    # Phase one parses each batch of sentences; phase two is a cheap sequential
+    # pass that carries current_date from one segment to the next, across batches
+    # One reference day for the whole paragraph, e.g. the day the email arrived
+    today = today or datetime.today()
     current_date = None
-    schedule = []
-    # print(sentences)
-    # Extract event details from each sentence directly
-    for sentence in sentences:
-        # Use the split_sentences function to get segments
-        split_sentences_list = split_sentences(sentence)
-        for seg in split_sentences_list:
-            event_details, current_date = extract_event_details(seg, current_date) 
-             # Pass current_date and receive updated current_date
-            # print(event_details)
-            if event_details:  # Append only if event details are valid
-                schedule.append(event_details)
-
-    # Ensure each event has consistent fields
-    return [
-        {
-            "Event": item.get("Event", "Unknown Event"),
-            "Date": item.get("Date", "No Date"),
-            "Time": item.get("Time", "No Time")
-        }
-        for item in schedule if item is not None
-    ]
+    for start in range(0, len(sentences), batch_size):
+        batch = sentences[start:start + batch_size]
+        for segment in analyze_sentences(batch, batch_size, n_process, engine, today):
+            event_details, current_date = resolve_segment(segment, current_date)
+            if event_details:  # Yield only if event details are valid
+                # Ensure each event has consistent fields
+                yield {
+                    "Event": event_details.get("Event", "Unknown Event"),
+                    "Date": event_details.get("Date", "No Date"),
+                    "Time": event_details.get("Time", "No Time")
+                }
 
-def summarize_text(text):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    
-    # Calculate the lengths
-    text_length = len(text.split())  # Number of words in the text
-    
-    target_length = int(text_length * 0.4)  # 40% of original length
-    
-    # Set minimum and maximum lengths for summarization
-    max_length = max(target_length, 50)  # Ensure max_length is not too small
-    min_length = max(target_length // 2, 20)  # Ensure min_length is not too small
-    
-    # Generate summary
-    summary = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
-    return summary[0]['summary_text']
 
+def process_paragraph(paragraph: str, batch_size=None, n_process=None, engine=None, today=None) -> list:
+    """Process a paragraph and extract event details from each sentence.
 
+    `engine` names one of EXTRACTION_ENGINES (EXTRACTION_ENGINE by default); `today`
+    pins the date relative dates resolve against.
+    """
+    return list(iter_paragraph_events(paragraph, batch_size, n_process, engine, today))
 
 # Flask routes
 @app.route('/summarize', methods=['POST'])
@@ -455,6 +507,11 @@ def summarize():
     # Check if text was provided
     if not text:
         return jsonify({"error": "No text provided"}), 400
+
+    # Optional latency budget; the engine trades model size and beam width to meet it
+    deadline_ms = data.get('deadline_ms')
+    if deadline_ms is not None and (not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0):
+        return jsonify({"error": "deadline_ms must be a positive number"}), 400
     
     # Fetch email bodies stored in MongoDB and deduplicate
     emails = collection.find({}, {"_id": 0, "body": 1})
@@ -463,63 +520,412 @@ def summarize():
     # Combine the provided text with the email bodies
     combined_text = text + " ".join(email_bodies)  # Combine user-provided text and email bodies
     
-    # Generate summary for the combined text
-    summary = summarize_text(combined_text)
+    # Generate summary for the combined text, reusing it if this exact input was summarized before
+    plan = plan_summary(combined_text, deadline_ms)
+    if data.get('stream') or request.accept_mimetypes.best == 'text/event-stream':
+        return stream_summary_response(combined_text, plan)
+
+    max_length, min_length = summary_lengths(combined_text, plan["length_scale"])
+    cache_key = summary_cache_key(combined_text, max_length, min_length, summarizer_id(plan))
+    summary, cached = summary_cache.get_or_compute(cache_key, lambda: summarize_text(combined_text, plan))
     
-    return jsonify({"summary": summary})
+    return jsonify({"summary": summary, "cached": cached, "tier": plan["tier"], "num_beams": plan["num_beams"]})
+
+
+def sse(event, payload):
+    """Format one Server-Sent Event; the payload is JSON so newlines cannot break framing."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def stream_summary_response(combined_text, plan):
+    """Stream the summary as `token` events, then one `done` event carrying the full text."""
+    # Streaming decodes greedily, so it is cached separately from beam-search summaries
+    plan = dict(plan, num_beams=1)
+    max_length, min_length = summary_lengths(combined_text, plan["length_scale"])
+    cache_key = summary_cache_key(combined_text, max_length, min_length, summarizer_id(plan))
+
+    def generate():
+        cached_summary = summary_cache.get(cache_key)
+        if cached_summary is not None:
+            yield sse("token", {"token": cached_summary})
+            yield sse("done", {"summary": cached_summary, "cached": True, "tier": plan["tier"], "num_beams": 1})
+            return
+
+        pieces = []
+        try:
+            for piece in stream_summary(combined_text, plan):
+                pieces.append(piece)
+                yield sse("token", {"token": piece})
+        except Exception as e:
+            yield sse("error", {"error": str(e)})
+            return
+        summary = "".join(pieces).strip()
+        summary_cache.put(cache_key, summary)
+        yield sse("done", {"summary": summary, "cached": False, "tier": plan["tier"], "num_beams": 1})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Keep proxies from buffering
+    )
+
+
+@app.before_request
+def reset_parse_count():
+    _parse_stats.count = 0
+    _parse_stats.timings = {}
+
+
+def parse_report():
+    """spaCy parses made for the current request so far, and milliseconds per pipeline component."""
+    timings = getattr(_parse_stats, "timings", {})
+    return getattr(_parse_stats, "count", 0), {name: round(seconds * 1000, 1) for name, seconds in timings.items()}
+
+
+def log_parse_count(label):
+    parses, timings_ms = parse_report()
+    if parses:
+        breakdown = ", ".join(f"{name} {ms:.1f} ms" for name, ms in timings_ms.items())
+        logger.info("%s: %d spaCy parses (%s)", label, parses, breakdown)
+
+
+@app.after_request
+def report_parse_count(response):
+    """Expose how many spaCy parses the request needed, to keep the per-segment multiplier in check,
+    and where the parsing time went, per pipeline component.
+
+    A streamed body is generated after this runs, so streaming responses carry no such headers;
+    streamed /events reports the counts in its final line instead.
+    """
+    if response.is_streamed:
+        return response
+    parses, timings_ms = parse_report()
+    response.headers["X-Spacy-Parses"] = str(parses)
+    if timings_ms:
+        response.headers["Server-Timing"] = ", ".join(
+            f"spacy-{name};dur={ms:.1f}" for name, ms in timings_ms.items()
+        )
+    log_parse_count(f"{request.method} {request.path}")
+    return response
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once every eagerly loaded model is warm, 503 before that."""
+    is_ready = models.is_ready()
+    return jsonify({"ready": is_ready, "models": models.status()}), (200 if is_ready else 503)
+
+
+def extractor_version(engine):
+    """Everything that shapes an engine's output: the extraction code version and the model it parses with."""
+    return f"{EXTRACTOR_VERSION}/{engine}/{ENGINE_MODELS[engine]}"
+
+
+def collect_extraction(message, future):
+    """(email, events) once a pool task finishes, counting the worker's parsing against this request."""
+    if future is None:
+        return message, []
+    events, parses, timings = future.result()
+    _parse_stats.count = getattr(_parse_stats, "count", 0) + parses
+    for name, seconds in timings.items():
+        _record_timing(name, seconds)
+    return message, events
+
+
+def extract_emails(emails, engine, parallel=True):
+    """Yield (email, events) for each email, in order. Every body is its own paragraph, so no date carries over.
+
+    With EXTRACTION_WORKERS > 1 and `parallel`, bodies are extracted on the extraction pool with at
+    most two tasks per worker in flight, so memory stays bounded however many emails there are.
+    """
+    if EXTRACTION_WORKERS <= 1 or not parallel:
+        for message in emails:
+            body = message.get("body") or ""
+            yield message, (process_paragraph(body, engine=engine, today=message.get("received_at")) if body.strip() else [])
+        return
+
+    pool = models.get("extraction-pool")
+    in_flight = deque()
+    try:
+        for message in emails:
+            body = message.get("body") or ""
+            future = None
+            if body.strip():
+                future = pool.submit(extraction_worker.extract_email, body, engine, message.get("received_at"))
+            in_flight.append((message, future))
+            if len(in_flight) >= 2 * EXTRACTION_WORKERS:
+                yield collect_extraction(*in_flight.popleft())
+        while in_flight:
+            yield collect_extraction(*in_flight.popleft())
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); the next request starts a fresh pool
+        models.discard("extraction-pool")
+        raise
+
+
+def mailbox_emails(since=None):
+    """Message ids of stored emails ingested after `since` (all of them without it), in storage order,
+    and the cursor to pass as `since` next time: the highest ingest_seq returned.
+
+    While a lower number is still being written by another fetch, emails numbered after it are
+    held back, so the cursor never passes an email that has not landed yet.
+    """
+    query = {} if since is None else {"ingest_seq": {"$gt": since}}
+    horizon = ingest_horizon()
+    if horizon is not None:
+        # Emails stored before numbering began have no ingest_seq and are never held back
+        query = {"$and": [query, {"$or": [{"ingest_seq": {"$lte": horizon}}, {"ingest_seq": {"$exists": False}}]}]}
+    emails = list(collection.find(query, {"_id": 0, "message_id": 1, "ingest_seq": 1}))
+    cursor = max([message.get("ingest_seq", 0) for message in emails] + [since or 0])
+    return [message["message_id"] for message in emails if message.get("message_id")], cursor
+
+
+# Stored results are looked up this many message ids at a time, so a long mailbox is
+# never held in memory at once
+EMAIL_EVENTS_PAGE_SIZE = int(os.environ.get("EMAIL_EVENTS_PAGE_SIZE", "200"))
+
+
+def iter_email_events(engine, message_ids):
+    """Yield each email's events in order, extracting only emails that are new or that an older extractor processed.
+
+    Emails are handled a page at a time: stored results come out straight away, and the rest
+    follow as their extraction finishes.
+    """
+    version = extractor_version(engine)
+    # The same body stored under several message ids yields its events once
+    seen_bodies = set()
+    for start in range(0, len(message_ids), EMAIL_EVENTS_PAGE_SIZE):
+        page = message_ids[start:start + EMAIL_EVENTS_PAGE_SIZE]
+        records = email_event_store.load(page, engine, version)
+
+        stale = [message_id for message_id in page if message_id not in records]
+        extracted = iter(())
+        if stale:
+            logger.info("Extracting events from %d of %d emails", len(stale), len(page))
+            emails = collection.find(
+                {"message_id": {"$in": stale}}, {"_id": 0, "message_id": 1, "body": 1, "received_at": 1}
+            )
+            # Relative dates ("tomorrow") resolve against when each email arrived, so stored results stay valid
+            extracted = extract_emails(emails, engine, parallel=len(stale) > 1)
+
+        for message_id in page:
+            while message_id not in records:
+                message, events = next(extracted, (None, None))
+                if message is None:
+                    break  # Deleted since it was listed
+                records[message["message_id"]] = email_event_store.save(
+                    message["message_id"], engine, version, events, body_digest(message.get("body") or "")
+                )
+            record = records.get(message_id)
+            if record is None or record["body_hash"] in seen_bodies:
+                yield []  # Still one item per message id, so callers can count progress
+                continue
+            seen_bodies.add(record["body_hash"])
+            yield record["events"]
+
+
+def stored_email_events(engine, since=None):
+    """Events from stored emails ingested after `since`, and the cursor for the next call."""
+    message_ids, cursor = mailbox_emails(since)
+    return [event for events in iter_email_events(engine, message_ids) for event in events], cursor
+
+
+def ndjson(payload):
+    """One line of newline-delimited JSON."""
+    return json.dumps(payload) + "\n"
+
+
+def stream_events_response(text, engine, since):
+    """Stream events as NDJSON: an {"event": ...} line as soon as each one is resolved, then a final
+    {"done": true, "cursor": ...} line that also carries the request's spaCy parse count and timings.
+    The request text comes first, then the stored emails."""
+    message_ids, cursor = mailbox_emails(since)
+
+    def generate():
+        count = 0
+        try:
+            if text:
+                for event in iter_paragraph_events(text, engine=engine):
+                    count += 1
+                    yield ndjson({"event": event})
+            for events in iter_email_events(engine, message_ids):
+                for event in events:
+                    count += 1
+                    yield ndjson({"event": event})
+        except Exception as e:
+            yield ndjson({"error": str(e)})
+            return
+        parses, timings_ms = parse_report()
+        log_parse_count("POST /events (stream)")
+        yield ndjson({"done": True, "cursor": cursor, "count": count, "spacy_parses": parses, "spacy_ms": timings_ms})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Keep proxies from buffering
+    )
+
+
+def events_params(data):
+    """Validate an /events or /events/jobs body; raise ValueError with the message for a 400."""
+    text = data.get('text', '')
+
+    # Optional per-request choice of extraction engine
+    engine = data.get('engine') or EXTRACTION_ENGINE
+    if engine not in EXTRACTION_ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(EXTRACTION_ENGINES)}")
+
+    # Optional cursor from a previous response: only emails ingested after it are returned
+    since = data.get('since')
+    if since is not None and (not isinstance(since, int) or isinstance(since, bool) or since < 0):
+        raise ValueError("since must be a non-negative integer")
+
+    if not text and collection.count_documents({}, limit=1) == 0:
+        raise ValueError("No text provided")
+    return {"text": text, "engine": engine, "since": since}
+
+
+def run_event_job(job):
+    """Run one queued /events job, saving events after the request text and after each email."""
+    job_id, params = job["_id"], job["params"]
+    text, engine = params["text"], params["engine"]
+    _parse_stats.count = 0
+    _parse_stats.timings = {}
+
+    message_ids, cursor = mailbox_emails(params["since"])
+    # Each write is dropped, and the run abandoned, once another runner has reclaimed the job
+    if not event_jobs.set_total(job, len(message_ids) + (1 if text else 0)):
+        return
+    if text and not event_jobs.add_events(job, list(iter_paragraph_events(text, engine=engine))):
+        return
+    for events in iter_email_events(engine, message_ids):
+        if not event_jobs.add_events(job, events):
+            logger.warning("Event job %s was reclaimed by another runner; stopping", job_id)
+            return
+    event_jobs.finish(job, cursor)
+    log_parse_count(f"Event job {job_id}")
 
 
 @app.route('/events', methods=['POST'])
 def events():
     """Endpoint to extract event details from the provided text."""
     data = request.json
-    text = data.get('text', '')
+    try:
+        params = events_params(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    text, engine, since = params["text"], params["engine"], params["since"]
 
     # emails=fetch_emails()
 
-    
-    # Fetch email bodies from MongoDB and deduplicate
-    emails = collection.find({}, {"_id": 0, "body": 1})  # Retrieve email bodies from MongoDB
-    email_bodies = list(set([email["body"] for email in emails]))  # Deduplicate emails
-
-    if not text and not email_bodies:
-        return jsonify({"error": "No text provided"}), 400
-    
-    
-    # Combine the provided text with the email bodies
-    if email_bodies:
-        combined_text = text + " " + " ".join(email_bodies)  # Combine the input text with email bodies
-    else:
-        combined_text = text
+    # Opt-in streaming: events are sent as NDJSON lines while later emails are still being processed
+    if data.get('stream') or request.accept_mimetypes.best == 'application/x-ndjson':
+        return stream_events_response(text, engine, since)
 
     try:
-        # event_details = process_paragraph(text)
-        event_details = process_paragraph(combined_text)  # Process the combined text
-        return jsonify({"events": event_details})
+        # Only the request's own text is extracted every time; stored emails are extracted
+        # once per extractor version and merged in from email_event_store
+        event_details = process_paragraph(text, engine=engine) if text else []
+        mailbox_events, cursor = stored_email_events(engine, since)
+        event_details += mailbox_events
+        return jsonify({"events": event_details, "cursor": cursor})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/events/jobs', methods=['POST'])
+def create_events_job():
+    """Queue an /events extraction and return its job id at once; poll GET /events/jobs/<id> for results."""
+    try:
+        params = events_params(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    job_id = event_jobs.create(params)
+    event_job_runner.wake()
+    return jsonify({"job_id": job_id, "state": "queued", "status_url": f"/events/jobs/{job_id}"}), 202
+
+
+@app.route('/events/jobs/<job_id>', methods=['GET'])
+def get_events_job(job_id):
+    """Progress of a queued extraction, the events found so far, and the cursor once it is done."""
+    # Polling also restarts the runner in a fresh worker, so jobs orphaned by a restart resume
+    event_job_runner.wake()
+    job = event_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify({
+        "job_id": job["_id"],
+        "state": job["state"],
+        "progress": job["progress"],
+        "events": job["events"],
+        "cursor": job["cursor"],
+        "error": job["error"],
+    })
+
+
 import imaplib
 import email
-from bs4 import BeautifulSoup
 # import credentials  # Your credentials file
 from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError
 
 
 # MongoDB connection setup
 client = MongoClient("mongodb://localhost:27017/")
 db = client["emailDB"]
 collection = db["emails"]
+summary_cache = SummaryCache(db["summaries"])  # Summaries expire via a TTL index on created_at
+email_event_store = EmailEventStore(db["email_events"])  # Extracted events per message_id and engine
+event_jobs = EventJobStore(db["event_jobs"])  # Queued /events runs; expire via a TTL index on created_at
+event_job_runner = EventJobRunner(event_jobs, run_event_job)  # Started by the first /events/jobs request
+ingest_counter = db["counters"]  # "emails": the last ingest_seq taken, and the ones whose email is not written yet
+# How long an unreleased ingest_seq reservation holds /events cursors back before it is presumed abandoned
+INGEST_RESERVATION_SECONDS = int(os.environ.get("INGEST_RESERVATION_SECONDS", "60"))
+
+
+def reserve_ingest_seq():
+    """Take the next ingest_seq and record it as in flight until release_ingest_seq, so cursors wait for it.
+
+    The number and its reservation are written together: the update only applies if no other fetch
+    has taken a number since the counter was read, and is retried otherwise.
+    """
+    while True:
+        counter = ingest_counter.find_one({"_id": "emails"}, {"seq": 1}) or {}
+        seq = counter.get("seq", 0) + 1
+        try:
+            taken = ingest_counter.update_one(
+                {"_id": "emails", "seq": seq - 1},
+                {"$set": {"seq": seq}, "$push": {"pending": {"seq": seq, "reserved_at": datetime.now(timezone.utc)}}},
+                upsert=not counter,
+            )
+        except DuplicateKeyError:  # another fetch created the counter first
+            continue
+        if taken.matched_count or taken.upserted_id is not None:
+            return seq
+
+
+def release_ingest_seq(seq):
+    """Drop the reservation for `seq`, along with any abandoned ones."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=INGEST_RESERVATION_SECONDS)
+    ingest_counter.update_one({"_id": "emails"}, {"$pull": {"pending": {"seq": seq}}})
+    ingest_counter.update_one({"_id": "emails"}, {"$pull": {"pending": {"reserved_at": {"$lt": cutoff}}}})
+
+
+def ingest_horizon():
+    """Highest ingest_seq up to which every number has been written, or None if none is in flight.
+
+    A reservation older than INGEST_RESERVATION_SECONDS belongs to a fetch that died, and no longer holds cursors back.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=INGEST_RESERVATION_SECONDS)
+    counter = ingest_counter.find_one({"_id": "emails"}, {"pending": 1}) or {}
+    # pymongo reads datetimes back as naive UTC unless the client is tz_aware
+    in_flight = [reservation["seq"] for reservation in counter.get("pending", [])
+                 if reservation["reserved_at"].replace(tzinfo=timezone.utc) >= cutoff]
+    return min(in_flight) - 1 if in_flight else None
 
 import traceback
 
 from bson import ObjectId
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow  # <-- Import this
 from flask import jsonify
 import os
 import base64
@@ -536,28 +942,43 @@ SCOPES = [
 ]
 
 
+def load_google_api():
+    """Google client libraries, imported when a route first talks to Gmail or Calendar."""
+    discovery = timed_import("googleapiclient.discovery")
+    errors = timed_import("googleapiclient.errors")
+    credentials = timed_import("google.oauth2.credentials")
+    transport = timed_import("google.auth.transport.requests")
+    oauth_flow = timed_import("google_auth_oauthlib.flow")
+    return SimpleNamespace(
+        build=discovery.build, HttpError=errors.HttpError, Credentials=credentials.Credentials,
+        Request=transport.Request, InstalledAppFlow=oauth_flow.InstalledAppFlow
+    )
+
+
+models.register("google-api", load_google_api)
 
 
 @app.route('/fetch-emails', methods=['GET'])
 def fetch_emails():
     """Fetches emails using Gmail API and stores them in MongoDB."""
+    google = models.get("google-api")
     try:
         creds = None
         if os.path.exists('token.json'):
-            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+            creds = google.Credentials.from_authorized_user_file('token.json', SCOPES)
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
+                creds.refresh(google.Request())
             else:
-                flow = InstalledAppFlow.from_client_secrets_file(
+                flow = google.InstalledAppFlow.from_client_secrets_file(
                     'credentials.json', SCOPES)
                 creds = flow.run_local_server(port=5001,access_type='offline', prompt='consent')
             with open('token.json', 'w') as token:
                 token.write(creds.to_json())
 
         # Build the Gmail API service
-        service = build('gmail', 'v1', credentials=creds)
+        service = google.build('gmail', 'v1', credentials=creds)
 
         # Fetch the user's profile to get their email address
         profile = service.users().getProfile(userId='me').execute()
@@ -574,6 +995,8 @@ def fetch_emails():
             for message in messages:
                 msg = service.users().messages().get(userId='me', id=message['id']).execute()
                 message_id = msg['id']
+                # Gmail's receive time (ms since the epoch); relative dates in the body are read against it
+                received_at = datetime.fromtimestamp(int(msg['internalDate']) / 1000)
                 subject = ''
                 from_ = ''
                 body = ''
@@ -596,21 +1019,30 @@ def fetch_emails():
                     "message_id": message_id,
                     "subject": subject,
                     "from": from_,
-                    "body": body
+                    "body": body,
+                    "received_at": received_at
                 }
 
-                # Insert or update email data in MongoDB
-                collection.update_one(
-                    {"message_id": message_id},
-                    {"$set": email_data},
-                    upsert=True
-                )
+                # Insert or update email data in MongoDB. A new email is numbered in the same write,
+                # so it is never visible without its ingest_seq
+                if collection.find_one({"message_id": message_id}, {"_id": 1}) is not None:
+                    collection.update_one({"message_id": message_id}, {"$set": email_data})
+                else:
+                    seq = reserve_ingest_seq()
+                    try:
+                        collection.update_one(
+                            {"message_id": message_id},
+                            {"$set": email_data, "$setOnInsert": {"ingest_seq": seq}},
+                            upsert=True
+                        )
+                    finally:
+                        release_ingest_seq(seq)
 
                 emails.append(email_data)
 
         return jsonify({"emails": emails, "user_email": user_email})
 
-    except HttpError as error:
+    except google.HttpError as error:
         print(f"An error occurred: {error}")
         return jsonify({"error": f"An error occurred: {error}"}), 500
 
@@ -632,19 +1064,20 @@ from flask import jsonify
 def add_events():
     """Adds events to the user's Google Calendar."""
     try:
+        google = models.get("google-api")
         # Load credentials (omitting the token management for brevity)
         creds = None
         if os.path.exists('token.json'):
-            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+            creds = google.Credentials.from_authorized_user_file('token.json', SCOPES)
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
+                creds.refresh(google.Request())
             else:
                 return jsonify({"error": "User is not signed in."}), 401
 
         # Build the Calendar API service
-        service = build('calendar', 'v3', credentials=creds)
+        service = google.build('calendar', 'v3', credentials=creds)
 
         # Get events from request body
         events = request.json.get('events', [])
@@ -1,12 +1,12 @@
 from flask import Flask, request, jsonify
-from transformers import pipeline
+from summarizer import get_summarizer
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app)  # Allow CORS
 
 def summarize_text(text):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    summarizer = get_summarizer()
     
     # Calculate the lengths
     text_length = len(text.split())  # Number of words in the text
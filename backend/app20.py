@@ -1,12 +1,8 @@
 from flask import Flask, request, jsonify
-import spacy
-from spacy.matcher import Matcher
-import nltk
-from nltk.corpus import wordnet, stopwords
-from nltk.stem import WordNetLemmatizer
-from transformers import pipeline
+from nlp_models import TRAINED_MODEL_PATH, get_nlp, register_spacy_model
+from time_expressions import normalize_times
+from summarizer import get_summarizer
 from flask_cors import CORS
-from dateparser import parse
 from datetime import datetime, timedelta
 import re
 import os
@@ -17,70 +13,9 @@ from dateutil.parser._parser import ParserError
 app = Flask(__name__)
 CORS(app)  # Allow CORS
 
-# Ensure NLTK data is downloaded
-nltk.download('stopwords')
-nltk.download('wordnet')
-
-# Load spaCy model for English
-nlp = spacy.load('en_core_web_sm')
-
-# Initialize the NLTK WordNetLemmatizer
-lemmatizer = WordNetLemmatizer()
-
-def convert_time_phrases(time_string):
-    """
-    Convert standard times (e.g., '2:30 pm') and natural language time phrases (e.g., 'half past 3 pm') to 24-hour format.
-    """
-    time_string = time_string.lower().strip()
-
-    # Match standard time formats (e.g., '2:30 pm', '12:15 am')
-    standard_time_match = re.match(r"(\d{1,2}):(\d{2})\s*(am|pm)?", time_string)
-    if standard_time_match:
-        hour = int(standard_time_match.group(1))
-        minute = int(standard_time_match.group(2))
-        period = standard_time_match.group(3)
-
-        # Convert to 24-hour format
-        if period == "pm" and hour != 12:
-            hour += 12
-        elif period == "am" and hour == 12:
-            hour = 0
-
-        return f"{hour:02d}:{minute:02d}"
-
-    # Match phrases like 'half past 3 pm', 'quarter to 4 am'
-    phrase_match = re.search(r"(half past|quarter past|quarter to|o'clock)?\s*(\d{1,2})\s*(am|pm)?", time_string)
-    if phrase_match:
-        phrase = phrase_match.group(1)
-        hour = int(phrase_match.group(2))
-        period = phrase_match.group(3)
-
-        # Initialize minutes
-        minutes = 0
-
-        # Handle phrases
-        if phrase == "half past":
-            minutes = 30
-        elif phrase == "quarter past":
-            minutes = 15
-        elif phrase == "quarter to":
-            hour -= 1
-            if hour < 1:
-                hour = 12  # Wrap around midnight/midday
-            minutes = 45
-        elif phrase == "o'clock":
-            minutes = 0
-
-        # Convert to 24-hour format
-        if period == "pm" and hour != 12:
-            hour += 12
-        elif period == "am" and hour == 12:
-            hour = 0
-
-        return f"{hour:02d}:{minutes:02d}"
-
-    # If no valid time format is found, return the original string
-    return time_string
+# Extraction runs on the trained NER model (set TRAINED_MODEL_PATH); it is loaded once,
+# on the first request, and a missing model is reported without downloading anything
+register_spacy_model(TRAINED_MODEL_PATH)
 
 days_of_week = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
 
@@ -107,25 +42,19 @@ def get_next_day_by_name(today, day_name):
         days_ahead += 7
     return today + timedelta(days=days_ahead)
 
-def split_sentences(sentence: str) -> list:
-    """Split a sentence by commas or 'and' only if multiple twings are present."""
-    # Parse the sentence using spaCy to extract entities
-    doc = nlp(sentence)
-    
+def split_sentences(doc) -> list:
+    """Split a parsed sentence by commas or 'and' only if multiple twings are present."""
     # Find all time entities
     times = [ent.text for ent in doc.ents if ent.label_ == "TwE"]
 
-    # If there are multiple time entities, split the sentence
+    # If there are multiple time entities, split the sentence; only the new parts need parsing
     if len(times) > 1:
-        parts = re.split(r',|\band\b', sentence)
-        return [part.strip() for part in parts if part.strip()]
+        parts = re.split(r',|\band\b', doc.text)
+        return [get_nlp(TRAINED_MODEL_PATH)(part.strip()) for part in parts if part.strip()]
     
-    # If only one or no time found, return the sentence as a single item list
-    return [sentence.strip()]
+    # If only one or no time found, the sentence's own parse is the single segment
+    return [doc]
 
-# Load the trained spaCy model
-MODEL_PATH = "Replace with trained_model path"  # Replace with your model's path
-nlp = spacy.load(MODEL_PATH)
 
 
 def get_main_part(sentence):
@@ -134,9 +63,9 @@ def get_main_part(sentence):
     return sentence if sentence else "No event"
 
 
-def extract_event_details(sentence, current_date=None):
-    """Extract event details from the sentence."""
-    doc = nlp(sentence)
+def extract_event_details(doc, current_date=None):
+    """Extract event details from a parsed segment."""
+    sentence = doc.text
     dates = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
     times = [ent.text for ent in doc.ents if ent.label_ == "TIME"]
     
@@ -146,7 +75,6 @@ def extract_event_details(sentence, current_date=None):
 
     # Summarize the event
     summarized_event = get_main_part(sentence)
-    doc= nlp(sentence)
 
     for ent in doc.ents:
         if ent.label_=="EVENT":
@@ -177,7 +105,8 @@ def extract_event_details(sentence, current_date=None):
         except Exception as e:
             print(f"Error parsing date '{date_str}': {e}")
 
-    formatted_times = [convert_time_phrases(t) for t in times]
+    # All of the sentence's TIME entities in one batch; a range contributes its start and end
+    formatted_times = [time for span in normalize_times(times) for time in span if time]
 
     print(formatted_dates)
     if "cancelled" in sentence.lower():
@@ -216,8 +145,10 @@ def process_paragraph(paragraph: str) -> list:
     # print(sentences)
     # Extract event details from each sentence directly
     for sentence in sentences:
+        # Parse each sentence once; every stage below reuses this Doc
+        doc = get_nlp(TRAINED_MODEL_PATH)(sentence)
         # Use the split_sentences function to get segments
-        split_sentences_list = split_sentences(sentence)
+        split_sentences_list = split_sentences(doc)
         for seg in split_sentences_list:
             event_details, current_date = extract_event_details(seg, current_date) 
              # Pass current_date and receive updated current_date
@@ -236,7 +167,7 @@ def process_paragraph(paragraph: str) -> list:
     ]
 
 def summarize_text(text):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    summarizer = get_summarizer()
     
     # Calculate the lengths
     text_length = len(text.split())  # Number of words in the text
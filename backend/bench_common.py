@@ -0,0 +1,81 @@
+"""Helpers shared by the benchmark scripts: corpora, percentiles, F1, and one subprocess per variant.
+
+A benchmark that compares variants (summarizer backends, extraction engines)
+runs each one in a fresh `python <script> --worker <variant>` process so its
+peak RSS is its own. The worker prints its results as one JSON line.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus")
+
+
+def load_corpus(path):
+    with open(path) as corpus_file:
+        return json.load(corpus_file)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values`, q in [0, 100]."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def precision_recall_f1(matched, predicted_total, reference_total):
+    precision = matched / predicted_total if predicted_total else 0.0
+    recall = matched / reference_total if reference_total else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far."""
+    # ru_maxrss is reported in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def add_variant_arguments(parser, corpus_path, repeats_help):
+    """The options every variant benchmark takes, plus the internal --worker one."""
+    parser.add_argument("--repeats", type=int, default=3, help=repeats_help)
+    parser.add_argument("--corpus", default=corpus_path)
+    parser.add_argument("--output", help="write the full results as JSON to this path")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)  # internal: run one variant and print JSON
+
+
+def run_variants(script, variants, args):
+    """Run `script --worker <variant>` for each variant in its own process; return their JSON results."""
+    results = []
+    for variant in variants:
+        print(f"Running {variant}...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(script), "--worker", variant,
+             "--repeats", str(args.repeats), "--corpus", args.corpus],
+            capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def print_table(columns, rows):
+    """One line per row under a header; `columns` are (title, width, value(row)), the first left-aligned."""
+    def line(cells):
+        first, *rest = cells
+        return f"{first:<{columns[0][1]}} " + " ".join(
+            f"{cell:>{width}}" for cell, (_, width, _) in zip(rest, columns[1:])
+        )
+
+    header = line([title for title, _, _ in columns])
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(line([value(row) for _, _, value in columns]))
+
+
+def write_output(path, results):
+    if path:
+        with open(path, "w") as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,140 @@
+"""Microbenchmark: the substring-check date chain analyze_segment used vs. resolve_date.
+
+Both resolve the same DATE-entity strings against a fixed reference date (a
+Wednesday), a labelled set repeated as a mailbox would repeat them. Reports
+phrases per second and how many of the labelled phrases each one gets right.
+
+    python bench_date_resolver.py --repeats 5
+    python bench_date_resolver.py --show
+"""
+import argparse
+import ast
+import os
+import time
+from datetime import datetime, timedelta
+
+from dateutil.parser import parse
+
+from date_resolver import _resolve, normalize_phrase, resolve_date
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+LEGACY_FILE = "app18.py"
+REFERENCE = datetime(2024, 3, 13, 9, 30)
+
+# DATE-entity text and the day it means, seen from REFERENCE
+EXPECTED = {
+    "today": "13-03-24",
+    "tonight": "13-03-24",
+    "tomorrow": "14-03-24",
+    "Tomorrow's": "14-03-24",
+    "the day after tomorrow": "15-03-24",
+    "yesterday": "12-03-24",
+    "next week": "18-03-24",
+    "next month": "01-04-24",
+    "in 3 days": "16-03-24",
+    "in two weeks": "27-03-24",
+    "this weekend": "16-03-24",
+    "Friday": "15-03-24",
+    "next Friday": "15-03-24",
+    "Wednesday": "20-03-24",
+    "Mondays": "18-03-24",
+    "Thursday, 21 March": "21-03-24",
+    "Saturday the 16th": "16-03-24",
+    "Tuesday the 2nd": "02-04-24",
+    "March 3": "03-03-24",
+    "21 September": "21-09-24",
+    "Sept. 14": "14-09-24",
+    "4/15": "15-04-24",
+    "10 April 2024": "10-04-24",
+}
+
+
+def load_legacy(filename, names=("get_next_monday", "get_first_day_of_next_month", "get_next_day_by_name")):
+    """The old date helpers from an app file, compiled on their own so the app's models and routes are not loaded."""
+    path = os.path.join(BACKEND_DIR, filename)
+    with open(path) as source_file:
+        tree = ast.parse(source_file.read(), path)
+    nodes = [node for node in tree.body if
+             (isinstance(node, ast.FunctionDef) and node.name in names)
+             or (isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "days_of_week" for target in node.targets))]
+    namespace = {"datetime": datetime, "timedelta": timedelta}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), path, "exec"), namespace)
+    return namespace
+
+
+def legacy_resolver(filename):
+    """The date chain from analyze_segment before resolve_date, as a function."""
+    helpers = load_legacy(filename)
+    days_of_week = helpers["days_of_week"]
+
+    def resolve(date_str, today):
+        try:
+            if "next week" in date_str.lower():
+                return helpers["get_next_monday"](today)
+            if "next month" in date_str.lower():
+                return helpers["get_first_day_of_next_month"](today)
+            for day_name in days_of_week:
+                if day_name in date_str.lower():
+                    return helpers["get_next_day_by_name"](today, day_name)
+            return parse(date_str, fuzzy=True, default=today.replace(hour=0, minute=0, second=0, microsecond=0))
+        except Exception:
+            return None
+
+    return resolve
+
+
+def formatted(value):
+    return value.strftime("%d-%m-%y") if value else None
+
+
+def best_of(repeats, run):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--copies", type=int, default=200, help="times each phrase recurs in the probe list")
+    parser.add_argument("--show", action="store_true", help="print both implementations' output per phrase")
+    args = parser.parse_args()
+
+    phrases = list(EXPECTED)
+    probes = phrases * args.copies
+    legacy = legacy_resolver(LEGACY_FILE)
+    outputs = {
+        LEGACY_FILE: [formatted(legacy(phrase, REFERENCE)) for phrase in phrases],
+        "resolve_date": [formatted(resolve_date(phrase, REFERENCE)) for phrase in phrases],
+    }
+
+    uncached = _resolve.__wrapped__  # The rule table alone, as if every phrase were new
+    reference_day = REFERENCE.date()
+
+    def cold():
+        _resolve.cache_clear()
+        [resolve_date(probe, REFERENCE) for probe in probes]
+
+    print(f"{len(probes)} phrases ({len(phrases)} distinct), best of {args.repeats}")
+    print(f"{'implementation':<28} {'phrases/s':>12} {'correct':>8}")
+    for label, name, run in ((LEGACY_FILE, LEGACY_FILE, lambda: [legacy(probe, REFERENCE) for probe in probes]),
+                             ("rules, no cache", "resolve_date",
+                              lambda: [uncached(normalize_phrase(probe), reference_day) for probe in probes]),
+                             ("resolve_date (cold cache)", "resolve_date", cold),
+                             ("resolve_date (warm cache)", "resolve_date", lambda: [resolve_date(probe, REFERENCE) for probe in probes])):
+        seconds = best_of(args.repeats, run)
+        correct = sum(output == EXPECTED[phrase] for phrase, output in zip(phrases, outputs[name]))
+        print(f"{label:<28} {len(probes) / seconds:>12,.0f} {correct:>5}/{len(phrases)}")
+
+    if args.show:
+        for index, phrase in enumerate(phrases):
+            print(f"\n{phrase!r} -> {EXPECTED[phrase]}")
+            for name, values in outputs.items():
+                print(f"    {name:<14} {values[index]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Compare the event extraction engines on the labelled email corpus.
+
+For each engine in EXTRACTION_ENGINES, reports model load time, sentences per
+second, p50/p99 per-paragraph latency, peak RSS and event-level precision,
+recall and F1 against the gold events in bench_corpus/emails.json.
+
+    python bench_engines.py                      # all engines
+    python bench_engines.py --engines trained --repeats 5
+    python bench_engines.py --output engines.json
+
+An extracted event matches a gold one when its Date and Time are equal and its
+name contains every word of the gold name ("Weekly design review" matches
+"design review"). "slot F1" ignores the name and scores Date and Time only.
+Each engine runs in its own subprocess so peak RSS is measured in isolation.
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from bench_common import (CORPUS_DIR, add_variant_arguments, load_corpus, peak_rss_mb, percentile,
+                          precision_recall_f1, print_table, run_variants, write_output)
+
+CORPUS_PATH = os.path.join(CORPUS_DIR, "emails.json")
+ENGINES = ("heuristic", "trained")
+
+
+def run_engine(engine, corpus, repeats):
+    """Load one engine in this process and time process_paragraph on the corpus."""
+    # Extraction only: do not warm the summarizer on import
+    os.environ.setdefault("MODEL_LOAD_MODE", "lazy")
+    import app19
+    from segmenter import segment_sentences
+
+    started = time.perf_counter()
+    app19.engine_nlp(engine)
+    load_seconds = time.perf_counter() - started
+
+    latencies = []
+    predictions = {}
+    sentences = 0
+    errors = 0
+    # One untimed paragraph so lazy initialisation does not count against the first document
+    with contextlib.suppress(Exception):
+        app19.process_paragraph(corpus[0]["text"], engine=engine)
+    for item in corpus:
+        today = datetime.strptime(item["reference_date"], "%Y-%m-%d")
+        events = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            try:
+                events = app19.process_paragraph(item["text"], engine=engine, today=today)
+            except Exception:
+                # A paragraph the engine cannot handle yields no events, as /events would
+                events = []
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        predictions[item["id"]] = events
+        sentences += len(segment_sentences(item["text"])) * repeats
+
+    return {
+        "engine": engine,
+        "load_seconds": round(load_seconds, 3),
+        "sentences_per_second": round(sentences / sum(latencies), 1),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "errors": errors // repeats,
+        "predictions": predictions,
+    }
+
+
+def _name_matches(predicted, gold):
+    words = set(re.findall(r"[\w-]+", predicted.lower()))
+    return all(word in words for word in gold.lower().split())
+
+
+def score(predictions, corpus, use_names=True):
+    """Event-level precision/recall/F1, pairing each gold event with at most one prediction."""
+    matched = predicted_total = gold_total = 0
+    for item in corpus:
+        unmatched = list(predictions.get(item["id"], []))
+        predicted_total += len(unmatched)
+        gold_total += len(item["events"])
+        for gold in item["events"]:
+            for candidate in unmatched:
+                if (candidate["Date"] == gold["Date"] and candidate["Time"] == gold["Time"]
+                        and (not use_names or _name_matches(candidate["Event"], gold["Event"]))):
+                    unmatched.remove(candidate)
+                    matched += 1
+                    break
+    precision, recall, f1 = precision_recall_f1(matched, predicted_total, gold_total)
+    return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=ENGINES)
+    add_variant_arguments(parser, CORPUS_PATH, "timed runs per paragraph")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if args.worker:
+        print(json.dumps(run_engine(args.worker, corpus, args.repeats)))
+        return
+
+    results = run_variants(__file__, args.engines, args)
+    for result in results:
+        result["events"] = score(result["predictions"], corpus)
+        result["slots"] = score(result["predictions"], corpus, use_names=False)
+
+    print_table([
+        ("engine", 10, lambda r: r["engine"]),
+        ("load s", 7, lambda r: r["load_seconds"]),
+        ("sent/s", 8, lambda r: r["sentences_per_second"]),
+        ("p50 ms", 8, lambda r: r["latency_p50_ms"]),
+        ("p99 ms", 8, lambda r: r["latency_p99_ms"]),
+        ("peak MB", 8, lambda r: r["peak_rss_mb"]),
+        ("errors", 6, lambda r: r["errors"]),
+        ("P", 6, lambda r: r["events"]["precision"]),
+        ("R", 6, lambda r: r["events"]["recall"]),
+        ("F1", 6, lambda r: r["events"]["f1"]),
+        ("slot F1", 8, lambda r: r["slots"]["f1"]),
+    ], results)
+    write_output(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Throughput and accuracy suite for process_paragraph on the labelled email corpus.
+
+Runs every paragraph in bench_corpus/emails.json through process_paragraph
+and reports sentences per second, p50/p95/p99 per-paragraph latency, spaCy
+parses per sentence, and event-level and slot-only F1 against the gold events
+(scored as in bench_engines.py). Save a run with --output and compare later
+runs against it with --baseline; the comparison exits non-zero when F1 drops
+or throughput falls by more than --tolerance.
+
+    python bench_extraction.py --output baseline.json
+    python bench_extraction.py --baseline baseline.json
+    python bench_extraction.py --engine trained --repeats 10
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+# Extraction only: do not start warming the summarizer on import
+os.environ.setdefault("MODEL_LOAD_MODE", "lazy")
+
+import app19
+from bench_common import load_corpus, percentile
+from bench_engines import CORPUS_PATH, ENGINES, score
+from segmenter import segment_sentences
+
+
+def run(corpus, engine, repeats):
+    """Extract events from every paragraph `repeats` times; return timings, parse counts and predictions."""
+    latencies = []
+    predictions = {}
+    sentences = parses = errors = 0
+    for item in corpus:
+        today = datetime.strptime(item["reference_date"], "%Y-%m-%d")
+        events = []
+        for _ in range(repeats):
+            app19._parse_stats.count = 0
+            started = time.perf_counter()
+            try:
+                events = app19.process_paragraph(item["text"], engine=engine, today=today)
+            except Exception:
+                # A paragraph the extractor cannot handle yields no events
+                events = []
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        # Parsing is deterministic, so the last run's count stands for every run
+        parses += app19._parse_stats.count
+        sentences += len(segment_sentences(item["text"]))
+        predictions[item["id"]] = events
+    return {
+        "paragraphs": len(corpus),
+        "sentences": sentences,
+        "sentences_per_second": round(sentences * repeats / sum(latencies), 1),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "parses_per_sentence": round(parses / sentences, 3),
+        "errors": errors // repeats,
+        "events": score(predictions, corpus),
+        "slots": score(predictions, corpus, use_names=False),
+        "predictions": predictions,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Print each metric next to the baseline; return False on an accuracy drop or a slowdown beyond `tolerance`."""
+    rows = [
+        ("sentences/sec", "sentences_per_second", True),
+        ("p50 ms", "latency_p50_ms", False),
+        ("p95 ms", "latency_p95_ms", False),
+        ("p99 ms", "latency_p99_ms", False),
+        ("parses/sentence", "parses_per_sentence", False),
+    ]
+    print(f"\n{'metric':<16} {'baseline':>10} {'current':>10} {'change':>8}")
+    for label, key, higher_is_better in rows:
+        old, new = baseline[key], result[key]
+        change = (new - old) / old if old else 0.0
+        print(f"{label:<16} {old:>10} {new:>10} {change:>+8.1%}" + ("" if higher_is_better else "  (lower is better)"))
+    for label, key in (("event F1", "events"), ("slot F1", "slots")):
+        print(f"{label:<16} {baseline[key]['f1']:>10} {result[key]['f1']:>10} "
+              f"{result[key]['f1'] - baseline[key]['f1']:>+8.3f}")
+
+    ok = True
+    if result["events"]["f1"] < baseline["events"]["f1"] or result["slots"]["f1"] < baseline["slots"]["f1"]:
+        print("REGRESSION: accuracy dropped")
+        ok = False
+    if result["sentences_per_second"] < baseline["sentences_per_second"] * (1 - tolerance):
+        print(f"REGRESSION: throughput fell by more than {tolerance:.0%}")
+        ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per paragraph")
+    parser.add_argument("--engine", choices=ENGINES, default=app19.EXTRACTION_ENGINE)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="fraction of baseline throughput that may be lost before failing (default 0.10)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    # One untimed pass so model loading and lazy initialisation do not count against the first paragraphs
+    run(corpus[:1], args.engine, 1)
+    result = {
+        "engine": args.engine,
+        "spacy_profiles": app19.SPACY_PROFILES,
+        "repeats": args.repeats,
+        "python": platform.python_version(),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        **run(corpus, args.engine, args.repeats),
+    }
+
+    print(f"{result['paragraphs']} paragraphs, {result['sentences']} sentences, engine {args.engine}, "
+          f"{args.repeats} repeats")
+    print(f"  {result['sentences_per_second']} sentences/sec")
+    print(f"  latency p50 {result['latency_p50_ms']} ms, p95 {result['latency_p95_ms']} ms, "
+          f"p99 {result['latency_p99_ms']} ms per paragraph")
+    print(f"  {result['parses_per_sentence']} spaCy parses per sentence, {result['errors']} paragraphs failed")
+    for label, key in (("events", "events"), ("slots ", "slots")):
+        scores = result[key]
+        print(f"  {label} P {scores['precision']}  R {scores['recall']}  F1 {scores['f1']}")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(result, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if not compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
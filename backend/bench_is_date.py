@@ -0,0 +1,73 @@
+"""Microbenchmark: dateutil-based is_date vs. the precompiled looks_like_date.
+
+Replays the probes get_main_part makes over the benchmark corpus: one check
+per candidate token (a priority word or a noun) that is not already skipped as
+a time indicator or weekday. Checks both functions agree and reports probes
+per second for each.
+
+    python bench_is_date.py --repeats 5
+"""
+import argparse
+import json
+import os
+import time
+
+# Date checks only: do not start warming the summarizer or its worker pool on import
+os.environ.setdefault("MODEL_LOAD_MODE", "lazy")
+os.environ.setdefault("SUMMARIZER_WORKERS", "0")
+
+import app19
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus", "summaries.json")
+
+
+def load_probes(path):
+    """The token texts get_main_part would pass to looks_like_date, in order."""
+    with open(path) as corpus_file:
+        texts = [item["text"] for item in json.load(corpus_file)]
+    probes = []
+    # Tagged like get_main_part's input: candidates are priority words and nouns
+    for doc in app19.parse_texts(texts):
+        tables = app19._main_part_tables(doc.vocab)
+        candidates = {i for _, i, _ in tables.matcher(doc)} | {token.i for token in doc if token.pos == tables.noun}
+        probes.extend(doc[i].text for i in sorted(candidates) if doc[i].lower not in tables.skipped_lowers)
+    return probes
+
+
+def run(check, probes):
+    """Time one pass of get_main_part-style probing and return (seconds, answers)."""
+    started = time.perf_counter()
+    answers = [check(probe) for probe in probes]
+    return time.perf_counter() - started, answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    probes = load_probes(args.corpus)
+    timings = {"is_date": [], "looks_like_date (cold memo)": [], "looks_like_date (warm memo)": []}
+    reference = None
+    mismatches = 0
+    for _ in range(args.repeats):
+        seconds, reference = run(app19.is_date, probes)
+        timings["is_date"].append(seconds)
+
+        app19._is_date_memo.cache_clear()
+        seconds, answers = run(app19.looks_like_date, probes)
+        timings["looks_like_date (cold memo)"].append(seconds)
+        seconds, _ = run(app19.looks_like_date, probes)
+        timings["looks_like_date (warm memo)"].append(seconds)
+        mismatches = sum(a != b for a, b in zip(reference, answers))
+
+    print(f"{len(probes)} tokens probed, {mismatches} disagreements")
+    baseline = min(timings["is_date"])
+    for name, values in timings.items():
+        best = min(values)
+        print(f"{name:<28} {len(probes) / best:>12.0f} tokens/s  {best * 1000:>9.2f} ms  {baseline / best:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
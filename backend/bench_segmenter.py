@@ -0,0 +1,65 @@
+"""Count the spaCy parses the segmenter saves over splitting on every ".".
+
+Every segment is one spaCy parse in process_paragraph, so fewer segments
+means fewer NLP calls. Prints per-document and total segment counts for the
+old split and for segment_sentences, plus segmentation throughput.
+
+    python bench_segmenter.py
+    python bench_segmenter.py --corpus bench_corpus/summaries.json --show
+"""
+import argparse
+import json
+import os
+import time
+
+from segmenter import segment_sentences
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus", "emails.json")
+
+
+def split_on_periods(paragraph):
+    """The segmentation process_paragraph used before the segmenter."""
+    return [sentence.strip() + '.' for sentence in paragraph.split('.') if sentence.strip()]
+
+
+def throughput(split, texts, repeats=20):
+    """Characters segmented per second, best of `repeats` passes."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for text in texts:
+            split(text)
+        best = min(best, time.perf_counter() - started)
+    return sum(len(text) for text in texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--show", action="store_true", help="print the segments of each document")
+    args = parser.parse_args()
+
+    with open(args.corpus) as corpus_file:
+        corpus = json.load(corpus_file)
+
+    old_total = new_total = 0
+    print(f"{'document':<20} {'split(.)':>9} {'segment':>8} {'saved':>6}")
+    for item in corpus:
+        old, new = split_on_periods(item["text"]), segment_sentences(item["text"])
+        old_total += len(old)
+        new_total += len(new)
+        print(f"{item['id']:<20} {len(old):>9} {len(new):>8} {len(old) - len(new):>6}")
+        if args.show:
+            for sentence in new:
+                print(f"    | {sentence}")
+    saved = old_total - new_total
+    print(f"{'total':<20} {old_total:>9} {new_total:>8} {saved:>6}  "
+          f"({saved / old_total:.0%} fewer spaCy parses)")
+
+    texts = [item["text"] for item in corpus]
+    print(f"split(.) {throughput(split_on_periods, texts) / 1e6:.1f} MB/s, "
+          f"segment {throughput(segment_sentences, texts) / 1e6:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-component spaCy time for event extraction, with and without stage profiles.
+
+Runs process_paragraph over the email corpus twice: once with every stage
+running the full pipeline (SPACY_PROFILES=0) and once with per-stage
+profiles. Prints milliseconds spent in each component and checks both runs
+extract the same events.
+
+    python bench_spacy_profiles.py --repeats 5
+"""
+import argparse
+import json
+import os
+
+# Extraction only: do not start warming the summarizer on import
+os.environ.setdefault("MODEL_LOAD_MODE", "lazy")
+
+import app19
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus", "emails.json")
+
+
+def run(texts, profiles, repeats):
+    """Extract events from every text; return the events and the best per-component seconds."""
+    app19.SPACY_PROFILES = profiles
+    best = {}
+    for _ in range(repeats):
+        app19._parse_stats.timings = {}
+        events = [app19.process_paragraph(text) for text in texts]
+        for name, seconds in app19._parse_stats.timings.items():
+            best[name] = min(best.get(name, seconds), seconds)
+    return events, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    with open(args.corpus) as corpus_file:
+        texts = [item["text"] for item in json.load(corpus_file)]
+
+    # One untimed pass so lazy initialisation does not count against either run
+    run(texts, True, 1)
+    full_events, full = run(texts, False, args.repeats)
+    profiled_events, profiled = run(texts, True, args.repeats)
+
+    print(f"{'component':<16} {'full ms':>9} {'profiled ms':>12}")
+    for name in ["tokenizer"] + app19.get_nlp().pipe_names:
+        print(f"{name:<16} {full.get(name, 0) * 1000:>9.1f} {profiled.get(name, 0) * 1000:>12.1f}")
+    full_total, profiled_total = sum(full.values()), sum(profiled.values())
+    print(f"{'total':<16} {full_total * 1000:>9.1f} {profiled_total * 1000:>12.1f}  "
+          f"({1 - profiled_total / full_total:.0%} less spaCy time)")
+    print("same events" if full_events == profiled_events else "EVENTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark the summarizer backends on a fixed corpus.
+
+Reports per-call latency, model load time, peak RSS and ROUGE drift of each
+backend's summaries against the stock transformers pipeline.
+
+    python bench_summarizer.py                       # all backends
+    python bench_summarizer.py --backends pipeline quantized --repeats 5
+    python bench_summarizer.py --output results.json
+
+Each backend runs in its own subprocess so peak RSS is measured in isolation.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from bench_common import (CORPUS_DIR, add_variant_arguments, load_corpus, peak_rss_mb, precision_recall_f1,
+                          print_table, run_variants, write_output)
+from summarizer import SUMMARIZER_BACKENDS, load_summarizer, summary_lengths
+
+CORPUS_PATH = os.path.join(CORPUS_DIR, "summaries.json")
+
+
+def run_backend(backend, corpus, repeats):
+    """Load one backend in this process and time it on the corpus."""
+    started = time.perf_counter()
+    summarizer = load_summarizer(backend)
+    load_seconds = time.perf_counter() - started
+
+    # One untimed call so lazy initialisation does not count against the first document
+    max_length, min_length = summary_lengths(corpus[0]["text"])
+    summarizer(corpus[0]["text"], max_length=max_length, min_length=min_length, do_sample=False)
+
+    latencies = []
+    summaries = {}
+    for item in corpus:
+        max_length, min_length = summary_lengths(item["text"])
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = summarizer(item["text"], max_length=max_length, min_length=min_length, do_sample=False)
+            latencies.append(time.perf_counter() - started)
+        summaries[item["id"]] = result[0]["summary_text"]
+
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 3),
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "latency_max_ms": round(max(latencies) * 1000, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "summaries": summaries,
+    }
+
+
+def _ngrams(tokens, n):
+    counts = {}
+    for i in range(len(tokens) - n + 1):
+        gram = tuple(tokens[i:i + n])
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def rouge_n(candidate, reference, n):
+    candidate_grams = _ngrams(candidate.lower().split(), n)
+    reference_grams = _ngrams(reference.lower().split(), n)
+    overlap = sum(min(count, reference_grams.get(gram, 0)) for gram, count in candidate_grams.items())
+    return precision_recall_f1(overlap, sum(candidate_grams.values()), sum(reference_grams.values()))[2]
+
+
+def rouge_l(candidate, reference):
+    candidate_tokens = candidate.lower().split()
+    reference_tokens = reference.lower().split()
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(reference_tokens) + 1)
+    for candidate_token in candidate_tokens:
+        current = [0]
+        for j, reference_token in enumerate(reference_tokens):
+            if candidate_token == reference_token:
+                current.append(previous[j] + 1)
+            else:
+                current.append(max(previous[j + 1], current[j]))
+        previous = current
+    return precision_recall_f1(previous[-1], len(candidate_tokens), len(reference_tokens))[2]
+
+
+def rouge_drift(summaries, reference_summaries):
+    """Mean ROUGE F1 of a backend's summaries against the reference backend's."""
+    scores = {"rouge1": [], "rouge2": [], "rougeL": []}
+    for doc_id, reference in reference_summaries.items():
+        candidate = summaries[doc_id]
+        scores["rouge1"].append(rouge_n(candidate, reference, 1))
+        scores["rouge2"].append(rouge_n(candidate, reference, 2))
+        scores["rougeL"].append(rouge_l(candidate, reference))
+    return {name: round(statistics.mean(values), 4) for name, values in scores.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(SUMMARIZER_BACKENDS), choices=SUMMARIZER_BACKENDS)
+    add_variant_arguments(parser, CORPUS_PATH, "timed calls per document")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, corpus, args.repeats)))
+        return
+
+    results = run_variants(__file__, args.backends, args)
+
+    # Drift is measured against the stock pipeline when it was run, else the first backend
+    reference = next((r for r in results if r["backend"] == "pipeline"), results[0])
+    rouge_key = "rouge_vs_" + reference["backend"]
+    for result in results:
+        result[rouge_key] = rouge_drift(result["summaries"], reference["summaries"])
+
+    print_table([
+        ("backend", 10, lambda r: r["backend"]),
+        ("load s", 7, lambda r: r["load_seconds"]),
+        ("mean ms", 9, lambda r: r["latency_mean_ms"]),
+        ("p50 ms", 9, lambda r: r["latency_p50_ms"]),
+        ("max ms", 9, lambda r: r["latency_max_ms"]),
+        ("peak MB", 8, lambda r: r["peak_rss_mb"]),
+        ("R-1", 6, lambda r: r[rouge_key]["rouge1"]),
+        ("R-2", 6, lambda r: r[rouge_key]["rouge2"]),
+        ("R-L", 6, lambda r: r[rouge_key]["rougeL"]),
+    ], results)
+    write_output(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
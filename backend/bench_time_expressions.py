@@ -0,0 +1,122 @@
+"""Microbenchmark: the convert_time_phrases copies in the app files vs. normalize_times.
+
+Each implementation converts the same TIME-entity strings, a labelled set
+repeated as a mailbox would repeat them. Reports strings per second and how
+many of the labelled expressions each one gets right. Ranges are expected as
+"HH:MM-HH:MM"; the old converters return a single time for them at best.
+
+    python bench_time_expressions.py --repeats 5
+    python bench_time_expressions.py --show
+"""
+import argparse
+import ast
+import os
+import re
+import time
+
+from time_expressions import normalize_time, normalize_times
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+LEGACY_FILES = ("app.py", "app10.py", "app18.py")
+
+# TIME-entity text and the 24-hour time (or range) it means
+EXPECTED = {
+    "3 PM": "15:00",
+    "3.30 p.m.": "15:30",
+    "10.30 a.m.": "10:30",
+    "9:45am": "09:45",
+    "14:00": "14:00",
+    "7.45": "07:45",
+    "noon": "12:00",
+    "midnight": "00:00",
+    "5 o'clock": "05:00",
+    "half past 3": "03:30",
+    "half past three pm": "15:30",
+    "quarter past 9 am": "09:15",
+    "quarter to 4 pm": "15:45",
+    "ten to five": "04:50",
+    "7 in the evening": "19:00",
+    "2-4pm": "14:00-16:00",
+    "11-1pm": "11:00-13:00",
+    "from 9 to 11.30 a.m.": "09:00-11:30",
+    "between 1 and 2 pm": "13:00-14:00",
+    "2 p.m. to 4.30 p.m.": "14:00-16:30",
+    "9.15 a.m. to 9.45 a.m.": "09:15-09:45",
+    "10am-12pm": "10:00-12:00",
+    # Durations spaCy also tags as TIME: not clock times, so they pass through unchanged
+    "two hours": "two hours",
+    "five minutes": "five minutes",
+    "ten minutes": "ten minutes",
+    "10 mins": "10 mins",
+    "the next two hours": "the next two hours",
+}
+
+
+def load_legacy(filename, name="convert_time_phrases"):
+    """One function from an app file, compiled on its own so the app's models and routes are not loaded."""
+    path = os.path.join(BACKEND_DIR, filename)
+    with open(path) as source_file:
+        tree = ast.parse(source_file.read(), path)
+    node = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name)
+    namespace = {"re": re}
+    exec(compile(ast.Module(body=[node], type_ignores=[]), path, "exec"), namespace)
+    return namespace[name]
+
+
+def as_text(span):
+    start, end = span
+    return f"{start}-{end}" if end else start
+
+
+def best_of(repeats, run):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--copies", type=int, default=200, help="times each expression recurs in the probe list")
+    parser.add_argument("--show", action="store_true", help="print every implementation's output per expression")
+    args = parser.parse_args()
+
+    phrases = list(EXPECTED)
+    probes = phrases * args.copies
+    legacy = {filename: load_legacy(filename) for filename in LEGACY_FILES}
+
+    outputs = {filename: [convert(phrase) for phrase in phrases] for filename, convert in legacy.items()}
+    outputs["normalize_times"] = [as_text(span) for span in normalize_times(phrases)]
+
+    print(f"{len(probes)} strings ({len(phrases)} distinct), best of {args.repeats}")
+    print(f"{'implementation':<28} {'strings/s':>12} {'correct':>8}")
+    for filename, convert in legacy.items():
+        seconds = best_of(args.repeats, lambda: [convert(probe) for probe in probes])
+        correct = sum(output == EXPECTED[phrase] for phrase, output in zip(phrases, outputs[filename]))
+        print(f"{filename:<28} {len(probes) / seconds:>12,.0f} {correct:>5}/{len(phrases)}")
+
+    correct = sum(output == EXPECTED[phrase] for phrase, output in zip(phrases, outputs["normalize_times"]))
+
+    def cold():
+        normalize_time.cache_clear()
+        normalize_times(probes)
+
+    uncached = normalize_time.__wrapped__  # The grammar alone, as if every string were new
+    for label, run in (("grammar, no cache", lambda: [uncached(probe) for probe in probes]),
+                       ("normalize_times (cold cache)", cold),
+                       ("normalize_times (warm cache)", lambda: normalize_times(probes))):
+        seconds = best_of(args.repeats, run)
+        print(f"{label:<28} {len(probes) / seconds:>12,.0f} {correct:>5}/{len(phrases)}")
+
+    if args.show:
+        for index, phrase in enumerate(phrases):
+            print(f"\n{phrase!r} -> {EXPECTED[phrase]}")
+            for name, values in outputs.items():
+                print(f"    {name:<18} {values[index]}")
+
+
+if __name__ == "__main__":
+    main()
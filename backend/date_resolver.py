@@ -0,0 +1,114 @@
+"""DATE entities resolved to calendar days against an explicit reference date.
+
+Relative phrases ("tomorrow", "next week", "in 3 days", "this weekend",
+"Friday") are matched against a table of precompiled rules; anything else
+falls back to dateutil with the reference date filling the missing fields.
+Results are memoized by (normalized phrase, reference day), so the phrases a
+mailbox repeats over and over resolve with a cache lookup.
+"""
+import re
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from dateutil.parser import parse
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_COUNTS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+           "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+
+def next_weekday(reference, weekday):
+    """The first `weekday` (0 = Monday) strictly after `reference`."""
+    days_ahead = (weekday - reference.weekday()) % 7 or 7
+    return reference + timedelta(days=days_ahead)
+
+
+def add_months(reference, months):
+    """The same day `months` later, clamped to the end of a shorter month."""
+    month_index = reference.month - 1 + months
+    year, month = reference.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(reference.day, monthrange(year, month)[1]))
+
+
+def weekday_on_day(reference, weekday, day):
+    """The first day-of-month `day` on or after `reference` that falls on `weekday`, within a year."""
+    for months in range(13):
+        year, month = add_months(reference.replace(day=1), months).timetuple()[:2]
+        if day <= monthrange(year, month)[1]:
+            candidate = date(year, month, day)
+            if candidate >= reference and candidate.weekday() == weekday:
+                return candidate
+    return None
+
+
+def _in_count(match, reference):
+    count = _COUNTS.get(match.group(1)) or int(match.group(1))
+    unit = match.group(2)
+    if unit == "month":
+        return add_months(reference, count)
+    return reference + timedelta(days=count * (7 if unit == "week" else 1))
+
+
+def _weekend(match, reference):
+    # The coming Saturday, or today when it is already Saturday; "next weekend" is the one after
+    saturday = reference if reference.weekday() == 5 else next_weekday(reference, 5)
+    return saturday + timedelta(days=7) if match.group(1) == "next" else saturday
+
+
+# Checked in order; the first rule whose pattern occurs in the phrase decides the date
+_RULES = [
+    (re.compile(r"\bday after tomorrow\b"), lambda match, reference: reference + timedelta(days=2)),
+    (re.compile(r"\btomorrow\b"), lambda match, reference: reference + timedelta(days=1)),
+    (re.compile(r"\byesterday\b"), lambda match, reference: reference - timedelta(days=1)),
+    (re.compile(r"\b(?:today|tonight|this (?:morning|afternoon|evening))\b"), lambda match, reference: reference),
+    (re.compile(r"\bnext week\b"), lambda match, reference: next_weekday(reference, 0)),
+    (re.compile(r"\bnext month\b"), lambda match, reference: add_months(reference.replace(day=1), 1)),
+    (re.compile(r"\bin (\d{1,3}|" + "|".join(_COUNTS) + r") (day|week|month)s?\b"), _in_count),
+    (re.compile(r"\b(this|next)?\s*weekend\b"), _weekend),
+]
+# A bare weekday ("Friday", "next Friday") is the next one after the reference date;
+# with a day number or month name ("Thursday, 21 March") the explicit date wins
+_WEEKDAY = re.compile(r"\b(" + "|".join(WEEKDAYS) + r")s?\b")
+_MONTH = re.compile(r"\b(?:" + "|".join(_MONTH_NAMES) + r")[a-z]*\b")
+_DIGIT = re.compile(r"\d")
+_POSSESSIVE = re.compile(r"['’]s\b")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_phrase(phrase):
+    """Lowercase, collapse whitespace and drop possessives, so "Tomorrow's" and "tomorrow" share a cache entry."""
+    return _SPACES.sub(" ", _POSSESSIVE.sub("", phrase.lower())).strip()
+
+
+@lru_cache(maxsize=8192)
+def _resolve(phrase, reference):
+    for pattern, resolve in _RULES:
+        match = pattern.search(phrase)
+        if match:
+            return resolve(match, reference)
+
+    weekday = _WEEKDAY.search(phrase)
+    weekday = WEEKDAYS.index(weekday.group(1)) if weekday else None
+    has_month = _MONTH.search(phrase)
+    if weekday is not None and not has_month and not _DIGIT.search(phrase):
+        return next_weekday(reference, weekday)
+    try:
+        parsed = parse(phrase, fuzzy=True, default=datetime(reference.year, reference.month, reference.day)).date()
+    except (ValueError, OverflowError):
+        return next_weekday(reference, weekday) if weekday is not None else None
+    if weekday is not None and not has_month and parsed.weekday() != weekday:
+        # "Tuesday the 3rd": the next 3rd that is a Tuesday, not this month's 3rd
+        return weekday_on_day(reference, weekday, parsed.day) or next_weekday(reference, weekday)
+    return parsed
+
+
+def resolve_date(phrase, reference):
+    """The day a DATE entity refers to, as a date, or None if it names no day.
+
+    `reference` (a date or datetime) is the day relative phrases count from, e.g. when the email arrived.
+    """
+    if isinstance(reference, datetime):
+        reference = reference.date()
+    return _resolve(normalize_phrase(phrase), reference)
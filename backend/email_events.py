@@ -0,0 +1,53 @@
+"""Events extracted from each stored email, kept per message_id so /events only processes new mail."""
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from mongo_indexes import LazyIndexes
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to extraction changes the events it produces; results
+# stored by an older version are re-extracted on the next request
+EXTRACTOR_VERSION = "3"
+
+
+def body_digest(body):
+    """Content hash of an email body, used to skip duplicate copies of the same message."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class EmailEventStore:
+    """Extraction results per (message_id, engine), each tagged with the extractor version that produced it."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexes = LazyIndexes(collection, ([("message_id", 1), ("engine", 1)], {"unique": True}))
+
+    def load(self, message_ids, engine, version):
+        """Stored results for `message_ids` that `version` produced, keyed by message_id."""
+        try:
+            self._indexes.ensure()
+            records = self.collection.find(
+                {"message_id": {"$in": list(message_ids)}, "engine": engine, "extractor_version": version},
+                {"_id": 0, "message_id": 1, "events": 1, "body_hash": 1}
+            )
+            return {record["message_id"]: record for record in records}
+        except Exception as error:
+            # A database outage means re-extracting, not failing the request
+            logger.warning("Email event lookup failed: %s", error)
+            return {}
+
+    def save(self, message_id, engine, version, events, body_hash):
+        """Store the events extracted from one email and return the stored record."""
+        record = {"message_id": message_id, "events": events, "body_hash": body_hash}
+        try:
+            self._indexes.ensure()
+            self.collection.update_one(
+                {"message_id": message_id, "engine": engine},
+                {"$set": dict(record, extractor_version=version, extracted_at=datetime.now(timezone.utc))},
+                upsert=True
+            )
+        except Exception as error:
+            logger.warning("Email event write failed: %s", error)
+        return record
@@ -0,0 +1,148 @@
+"""Queued /events extraction jobs, stored in Mongo so they outlive the web worker that accepted them."""
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+from mongo_indexes import LazyIndexes
+
+logger = logging.getLogger(__name__)
+
+EVENT_JOB_TTL_SECONDS = int(os.environ.get("EVENT_JOB_TTL_SECONDS", str(24 * 3600)))
+# A running job that has not reported progress for this long is assumed orphaned
+# (its worker died or restarted) and is run again by the next free runner
+EVENT_JOB_STALE_SECONDS = int(os.environ.get("EVENT_JOB_STALE_SECONDS", "300"))
+# How often an idle runner looks for jobs queued by other processes or orphaned ones
+EVENT_JOB_POLL_SECONDS = float(os.environ.get("EVENT_JOB_POLL_SECONDS", "5"))
+# A job orphaned this many times (e.g. its worker keeps getting OOM-killed) is marked failed instead of rerun
+EVENT_JOB_MAX_ATTEMPTS = int(os.environ.get("EVENT_JOB_MAX_ATTEMPTS", "3"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class EventJobStore:
+    """Job documents: parameters, state, progress, the events found so far and the final cursor."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexes = LazyIndexes(
+            collection,
+            ("created_at", {"expireAfterSeconds": EVENT_JOB_TTL_SECONDS}),
+            ([("state", 1), ("created_at", 1)], {}),
+        )
+
+    def create(self, params):
+        """Queue a job for `params` and return its id."""
+        self._indexes.ensure()
+        job_id = uuid.uuid4().hex
+        self.collection.insert_one({
+            "_id": job_id,
+            "params": params,
+            "state": QUEUED,
+            "progress": {"done": 0, "total": None},
+            "events": [],
+            "cursor": None,
+            "error": None,
+            "attempts": 0,
+            "created_at": _now(),
+        })
+        return job_id
+
+    def get(self, job_id):
+        return self.collection.find_one({"_id": job_id})
+
+    def claim(self):
+        """Atomically take the oldest queued or orphaned job and mark it running; None if there is none.
+
+        The returned document's `attempts` identifies this claim: writes made for it are
+        dropped once the job has been reclaimed by another runner.
+        """
+        self._indexes.ensure()
+        now = _now()
+        stale = {"state": RUNNING, "heartbeat_at": {"$lt": now - timedelta(seconds=EVENT_JOB_STALE_SECONDS)}}
+        self.collection.update_many(
+            dict(stale, attempts={"$gte": EVENT_JOB_MAX_ATTEMPTS}),
+            {"$set": {"state": FAILED, "finished_at": now,
+                      "error": f"Abandoned after {EVENT_JOB_MAX_ATTEMPTS} attempts"}}
+        )
+        return self.collection.find_one_and_update(
+            {"$or": [{"state": QUEUED}, dict(stale, attempts={"$lt": EVENT_JOB_MAX_ATTEMPTS})]},
+            {
+                # A reclaimed job starts over; emails it already extracted come back from the event store
+                "$set": {"state": RUNNING, "started_at": now, "heartbeat_at": now,
+                         "events": [], "progress.done": 0, "error": None},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _update(self, job, update):
+        """Apply `update` to a claimed job unless it has since been reclaimed; True if it was applied."""
+        result = self.collection.update_one(
+            {"_id": job["_id"], "state": RUNNING, "attempts": job["attempts"]}, update
+        )
+        return result.matched_count == 1
+
+    def set_total(self, job, total):
+        return self._update(job, {"$set": {"progress.total": total, "heartbeat_at": _now()}})
+
+    def add_events(self, job, events):
+        """Record one finished unit of work (the request text or one email) and the events it produced."""
+        return self._update(
+            job, {"$push": {"events": {"$each": events}}, "$inc": {"progress.done": 1}, "$set": {"heartbeat_at": _now()}}
+        )
+
+    def finish(self, job, cursor):
+        return self._update(job, {"$set": {"state": DONE, "cursor": cursor, "finished_at": _now()}})
+
+    def fail(self, job, error):
+        return self._update(job, {"$set": {"state": FAILED, "error": error, "finished_at": _now()}})
+
+
+class EventJobRunner:
+    """One background thread per process, running claimed jobs one at a time with `run_job(job)`."""
+
+    def __init__(self, store, run_job):
+        self.store = store
+        self.run_job = run_job
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self):
+        """Start the runner if it is not running yet, and have it look for work now."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="event-job-runner", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                job = self.store.claim()
+            except Exception as error:
+                logger.warning("Could not claim an event job: %s", error)
+                job = None
+            if job is None:
+                self._wake.wait(EVENT_JOB_POLL_SECONDS)
+                self._wake.clear()
+                continue
+
+            logger.info("Running event job %s (attempt %d)", job["_id"], job["attempts"])
+            try:
+                self.run_job(job)
+            except Exception as error:
+                logger.exception("Event job %s failed", job["_id"])
+                try:
+                    self.store.fail(job, str(error))
+                except Exception:
+                    logger.exception("Could not mark event job %s failed", job["_id"])
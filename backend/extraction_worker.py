@@ -0,0 +1,30 @@
+"""Email extraction worker process for app19's extraction pool (EXTRACTION_WORKERS).
+
+Each worker loads app19 once and then extracts one email body per task, so
+every email is parsed on its own and spaCy work spreads across cores.
+"""
+import os
+import sys
+
+app19 = None
+
+
+def init_worker():
+    """Load the extraction code; app19 sees it is in a pool worker and loads models lazily."""
+    global app19
+    # Under `python app19.py`, spawn has already re-run app19 in this worker as __mp_main__
+    main = sys.modules.get("__mp_main__")
+    if os.path.basename(getattr(main, "__file__", None) or "") == "app19.py":
+        app19 = main
+        return
+    os.environ["EXTRACTION_POOL_WORKER"] = "1"  # Read by app19 on import
+    import app19 as extraction
+    app19 = extraction
+
+
+def extract_email(body, engine, today):
+    """Events in one email body, with the spaCy parse count and per-component timings it cost."""
+    app19._parse_stats.count = 0
+    app19._parse_stats.timings = {}
+    events = app19.process_paragraph(body, engine=engine, today=today)
+    return events, app19._parse_stats.count, app19._parse_stats.timings
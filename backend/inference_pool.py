@@ -0,0 +1,220 @@
+"""Dedicated summarization worker processes, fed from a local job queue.
+
+Running BART outside the Flask process keeps generation from holding the
+web worker's GIL, so other routes stay responsive while summaries run.
+Each worker is a separate `inference_worker.py` process with pinned torch
+thread counts, connected to the pool over a local socket.
+"""
+import logging
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing.connection import Listener
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inference_worker.py")
+# Longest a request waits for its summary (or for the next streamed piece) before giving up
+INFERENCE_JOB_TIMEOUT_SECONDS = float(os.environ.get("INFERENCE_JOB_TIMEOUT_SECONDS", "300"))
+
+# Marks the end of a streamed job on its sink queue
+_STREAM_END = object()
+
+
+class InferenceError(RuntimeError):
+    """Raised in the web process when a worker fails a job."""
+
+
+class _Job:
+    def __init__(self, kind, payload, sink):
+        self.kind = kind
+        self.payload = payload
+        self.sink = sink  # A Future for batch jobs, a queue.Queue for streams
+
+
+class InferencePool:
+    """Fixed set of worker processes pulling summarization jobs from one queue.
+
+    `on_broken(error)` is called once if every worker has died and none could be restarted;
+    from then on every job fails at once.
+    """
+
+    def __init__(self, num_workers, intra_op_threads, inter_op_threads, on_broken=None):
+        self.num_workers = num_workers
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.on_broken = on_broken
+        self._jobs = queue.Queue()
+        self._live_workers = num_workers
+        self._live_lock = threading.Lock()
+        self._broken = None
+        self._authkey = os.urandom(32)
+        self._address = os.path.join(tempfile.mkdtemp(prefix="inference-pool-"), "pool.sock")
+        self._listener = Listener(self._address, family="AF_UNIX", authkey=self._authkey)
+        self._pending = {}
+        self.latency_samples = []
+
+    def start(self):
+        """Launch the workers and block until every one has loaded its models."""
+        threading.Thread(target=self._accept_loop, name="inference-pool-accept", daemon=True).start()
+        ready = [threading.Event() for _ in range(self.num_workers)]
+        failures = []
+        for worker_id in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._serve, args=(worker_id, ready[worker_id], failures),
+                name=f"inference-worker-{worker_id}", daemon=True
+            )
+            thread.start()
+        for event in ready:
+            event.wait()
+        if failures:
+            raise InferenceError(f"Inference worker failed to start: {failures[0]}")
+
+    def _accept_loop(self):
+        """Hand each incoming worker connection to the thread that launched that worker."""
+        while True:
+            connection = self._listener.accept()
+            kind, token = connection.recv()
+            slot = self._pending.pop(token, None) if kind == "hello" else None
+            if slot is None:
+                connection.close()
+                continue
+            slot.put(connection)
+
+    def _spawn(self):
+        """Start one worker process; return it with the connection it opens back to the pool."""
+        token = uuid.uuid4().hex
+        slot = queue.Queue()
+        self._pending[token] = slot
+        env = dict(os.environ)
+        env["INFERENCE_POOL_AUTHKEY"] = self._authkey.hex()
+        # BLAS/OpenMP read these before torch is imported
+        env["OMP_NUM_THREADS"] = str(self.intra_op_threads)
+        env["MKL_NUM_THREADS"] = str(self.intra_op_threads)
+        process = subprocess.Popen([
+            sys.executable, WORKER_SCRIPT, self._address, token,
+            str(self.intra_op_threads), str(self.inter_op_threads)
+        ], env=env)
+        while True:
+            try:
+                connection = slot.get(timeout=1)
+                break
+            except queue.Empty:
+                if process.poll() is not None:
+                    self._pending.pop(token, None)
+                    raise InferenceError(f"Inference worker exited with code {process.returncode}")
+        kind, value = connection.recv()  # Sent once the worker's models are warm
+        if kind != "ready":
+            process.kill()
+            raise InferenceError(value)
+        self.latency_samples.extend(value)
+        return process, connection
+
+    def _serve(self, worker_id, ready, failures):
+        """Feed jobs from the shared queue to one worker; respawn the worker if it dies."""
+        try:
+            process, connection = self._spawn()
+        except Exception as error:
+            logger.exception("Inference worker %d failed to start", worker_id)
+            failures.append(error)
+            ready.set()
+            return
+        ready.set()
+
+        while True:
+            job = self._jobs.get()
+            try:
+                connection.send((job.kind, job.payload))
+                self._relay(connection, job)
+            except (EOFError, OSError) as error:
+                logger.error("Inference worker %d died: %s; restarting it", worker_id, error)
+                self._fail(job, InferenceError(f"Inference worker died: {error}"))
+                process.kill()
+                try:
+                    process, connection = self._spawn()
+                except Exception as restart_error:
+                    logger.exception("Could not restart inference worker %d", worker_id)
+                    self._worker_lost(restart_error)
+                    return
+
+    def _worker_lost(self, error):
+        """One feeder is gone for good; once none are left, fail every waiting job and report the pool broken."""
+        with self._live_lock:
+            self._live_workers -= 1
+            if self._live_workers > 0:
+                return
+            self._broken = InferenceError(f"No inference workers left: {error}")
+        logger.error("Inference pool is broken: %s", error)
+        self._drain()
+        if self.on_broken:
+            self.on_broken(self._broken)
+
+    def _drain(self):
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            self._fail(job, self._broken)
+
+    def _submit(self, job):
+        if self._broken:
+            raise self._broken
+        self._jobs.put(job)
+        if self._broken:
+            self._drain()  # The last worker went away while this job was being queued
+
+    def _relay(self, connection, job):
+        """Pass one job's replies back to whoever is waiting on it."""
+        while True:
+            kind, value = connection.recv()
+            if kind == "chunk":
+                job.sink.put(value)
+            elif kind == "result":
+                if job.kind == "stream":
+                    job.sink.put(_STREAM_END)
+                else:
+                    job.sink.set_result(value)
+                return
+            else:
+                self._fail(job, InferenceError(value))
+                return
+
+    @staticmethod
+    def _fail(job, error):
+        if job.kind == "stream":
+            job.sink.put(error)
+            job.sink.put(_STREAM_END)
+        else:
+            job.sink.set_exception(error)
+
+    def run_batch(self, texts, gen_kwargs):
+        """Summarize `texts` in one batched generate call on the next free worker."""
+        future = Future()
+        self._submit(_Job("batch", {"texts": texts, "gen_kwargs": gen_kwargs}, future))
+        try:
+            return future.result(timeout=INFERENCE_JOB_TIMEOUT_SECONDS)
+        except FutureTimeout:
+            raise InferenceError(f"No summary after {INFERENCE_JOB_TIMEOUT_SECONDS:g}s") from None
+
+    def stream(self, text, tier, max_length, min_length):
+        """Yield summary pieces from a worker as it decodes them."""
+        sink = queue.Queue()
+        self._submit(_Job("stream", {
+            "text": text, "tier": tier, "max_length": max_length, "min_length": min_length
+        }, sink))
+        while True:
+            try:
+                piece = sink.get(timeout=INFERENCE_JOB_TIMEOUT_SECONDS)
+            except queue.Empty:
+                raise InferenceError(f"No summary output for {INFERENCE_JOB_TIMEOUT_SECONDS:g}s") from None
+            if piece is _STREAM_END:
+                return
+            if isinstance(piece, Exception):
+                raise piece
+            yield piece
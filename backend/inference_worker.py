@@ -0,0 +1,56 @@
+"""Summarization worker process started by inference_pool.InferencePool.
+
+    python inference_worker.py <socket address> <token> <intra-op threads> <inter-op threads>
+"""
+import os
+import sys
+from multiprocessing.connection import Client
+
+
+def main():
+    address, token, intra_op_threads, inter_op_threads = sys.argv[1:5]
+
+    # This process runs the models itself rather than starting another pool
+    os.environ["SUMMARIZER_WORKERS"] = "0"
+    os.environ["MODEL_LOAD_MODE"] = "eager"
+
+    import torch
+    torch.set_num_threads(int(intra_op_threads))
+    torch.set_num_interop_threads(int(inter_op_threads))
+
+    import summarizer
+
+    connection = Client(address, family="AF_UNIX", authkey=bytes.fromhex(os.environ["INFERENCE_POOL_AUTHKEY"]))
+    connection.send(("hello", token))
+    try:
+        summarizer.models.preload(background=False)
+        for name, status in summarizer.models.status().items():
+            if status["state"] != "ready":
+                raise RuntimeError(f"{name}: {status['error']}")
+    except Exception as error:
+        connection.send(("error", f"{type(error).__name__}: {error}"))
+        return
+    # Calibration ran here, but deadline planning happens in the web process
+    connection.send(("ready", summarizer.export_latency_samples()))
+
+    while True:
+        try:
+            kind, payload = connection.recv()
+        except EOFError:
+            return  # The pool went away
+        try:
+            if kind == "batch":
+                connection.send(("result", summarizer.run_local_batch(payload["texts"], payload["gen_kwargs"])))
+            elif kind == "stream":
+                for piece in summarizer.stream_generation(
+                        payload["text"], payload["tier"], payload["max_length"], payload["min_length"]):
+                    connection.send(("chunk", piece))
+                connection.send(("result", None))
+            else:
+                connection.send(("error", f"Unknown job kind '{kind}'"))
+        except Exception as error:
+            connection.send(("error", f"{type(error).__name__}: {error}"))
+
+
+if __name__ == "__main__":
+    main()
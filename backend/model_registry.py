@@ -0,0 +1,155 @@
+"""Process-wide registry for heavy models, so each worker loads them only once."""
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# "eager" loads models at startup and holds /ready at 503 until they are warm;
+# "lazy" loads each one on the first request that needs it instead
+MODEL_LOAD_MODE = os.environ.get("MODEL_LOAD_MODE", "eager").lower()
+
+# Lifecycle states reported by the readiness endpoint
+REGISTERED = "registered"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelRegistry:
+    """Loads registered models at most once and shares them across request threads."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, eager=False, check=None):
+        """Register a zero-argument loader under `name`; eager models gate readiness.
+
+        `check`, if given, confirms offline that the model's files are present and
+        raises if not; it runs before the loader and from verify().
+        """
+        with self._lock:
+            self._entries[name] = {
+                "loader": loader,
+                "eager": eager,
+                "check": check,
+                "lock": threading.Lock(),
+                "model": None,
+                "state": REGISTERED,
+                "error": None,
+                "load_seconds": None,
+            }
+
+    def get(self, name):
+        """Return the model registered as `name`, loading it on first use."""
+        entry = self._entries[name]
+        if entry["state"] == READY:
+            return entry["model"]
+
+        # Only one thread loads; the others block here until the model is warm
+        with entry["lock"]:
+            if entry["state"] != READY:
+                entry["state"] = LOADING
+                started = time.perf_counter()
+                try:
+                    if entry["check"]:
+                        entry["check"]()
+                    entry["model"] = entry["loader"]()
+                except Exception as error:
+                    entry["state"] = FAILED
+                    entry["error"] = str(error)
+                    logger.exception("Failed to load '%s'", name)
+                    raise
+                entry["load_seconds"] = round(time.perf_counter() - started, 3)
+                entry["error"] = None
+                entry["state"] = READY
+                logger.info("Loaded '%s' in %.2fs", name, entry["load_seconds"])
+        return entry["model"]
+
+    def discard(self, name):
+        """Forget a loaded model so the next get() loads it afresh, e.g. after a worker pool breaks."""
+        entry = self._entries[name]
+        with entry["lock"]:
+            entry["model"] = None
+            entry["state"] = REGISTERED
+            entry["load_seconds"] = None
+
+    def mark_failed(self, name, error):
+        """Record that a loaded model broke: /ready reports it, and the next get() loads it afresh."""
+        entry = self._entries[name]
+        with entry["lock"]:
+            entry["model"] = None
+            entry["state"] = FAILED
+            entry["error"] = str(error)
+            entry["load_seconds"] = None
+        logger.error("'%s' failed after loading: %s", name, error)
+
+    def verify(self):
+        """Run every resource check without loading anything; return {name: problem} for the failures."""
+        missing = {}
+        for name, entry in list(self._entries.items()):
+            if entry["check"] is None or entry["state"] == READY:
+                continue
+            try:
+                entry["check"]()
+            except Exception as error:
+                missing[name] = entry["error"] = str(error)
+                logger.warning("'%s' is not available offline: %s", name, error)
+        return missing
+
+    def preload(self, background=True):
+        """Load every eager model, optionally on a daemon thread so startup is not blocked."""
+        names = [name for name, entry in self._entries.items() if entry["eager"]]
+
+        def load_all():
+            self.verify()
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    pass  # Already logged; the readiness endpoint reports the failure
+            loaded = [f"{name} {self._entries[name]['load_seconds']}s" for name in names
+                      if self._entries[name]["state"] == READY]
+            if loaded:
+                logger.info("Startup load times: %s", ", ".join(loaded))
+
+        if background:
+            thread = threading.Thread(target=load_all, name="model-preload", daemon=True)
+            thread.start()
+            return thread
+        load_all()
+        return None
+
+    def is_ready(self):
+        """A worker is ready once all of its eager models are loaded."""
+        return all(entry["state"] == READY for entry in self._entries.values() if entry["eager"])
+
+    def status(self):
+        """Per-model state for the readiness endpoint."""
+        return {
+            name: {
+                "state": entry["state"],
+                "eager": entry["eager"],
+                "load_seconds": entry["load_seconds"],
+                "error": entry["error"],
+            }
+            for name, entry in self._entries.items()
+        }
+
+
+def timed_import(module_name):
+    """Import `module_name`, logging how long the first import took."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    logger.info("Imported %s in %.2fs", module_name, time.perf_counter() - started)
+    return module
+
+
+# Shared by every module in the worker process
+models = ModelRegistry()
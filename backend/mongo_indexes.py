@@ -0,0 +1,21 @@
+"""Indexes a Mongo-backed store needs, created on first use so importing the app does not need a live database."""
+import threading
+
+
+class LazyIndexes:
+    """Create `indexes`, each a (keys, options) pair for create_index, the first time ensure() is called."""
+
+    def __init__(self, collection, *indexes):
+        self.collection = collection
+        self.indexes = indexes
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def ensure(self):
+        if self._ready:
+            return
+        with self._lock:
+            if not self._ready:
+                for keys, options in self.indexes:
+                    self.collection.create_index(keys, **options)
+                self._ready = True
@@ -0,0 +1,41 @@
+"""spaCy models for event extraction, loaded once through the model registry.
+
+Nothing here downloads: missing models are reported by the registry's
+offline checks (and /ready) with the command that installs them.
+"""
+import importlib.util
+import os
+
+from model_registry import models, timed_import
+
+# General-purpose English pipeline behind app19's heuristic extraction
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+# Custom NER model (DATE, EVENT and TIME entities) checked in at the repository root
+TRAINED_MODEL_PATH = os.environ.get(
+    "TRAINED_MODEL_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "trained_model")
+)
+
+
+def check_spacy_model(name):
+    """Raise unless spacy.load(name) would find the model locally, without importing spaCy."""
+    if os.path.isdir(name) or importlib.util.find_spec(name) is not None:
+        return
+    raise OSError(f"spaCy model '{name}' is not installed; run `python -m spacy download {name}` "
+                  f"or point to a model directory")
+
+
+def load_spacy_model(name):
+    spacy = timed_import("spacy")
+    return spacy.load(name)
+
+
+def register_spacy_model(name, eager=False):
+    """Make get_nlp(name) available; the model loads once, on first use or at preload if eager."""
+    models.register(
+        "spacy:" + name, lambda: load_spacy_model(name), eager=eager, check=lambda: check_spacy_model(name)
+    )
+
+
+def get_nlp(name=SPACY_MODEL):
+    """The loaded spaCy pipeline registered under `name`."""
+    return models.get("spacy:" + name)
@@ -0,0 +1,111 @@
+"""Rule-based sentence segmentation for email text, run ahead of spaCy.
+
+Splitting on every "." breaks "3.30 pm", "a.m.", "e.g.", version numbers,
+URLs and email addresses into fragments, and each fragment costs a full
+spaCy parse. segment_sentences() makes one left-to-right pass instead:
+
+- ".", "!" and "?" end a sentence only when followed by whitespace, so dots
+  inside times, decimals, URLs and addresses never split;
+- titles and "e.g."-style abbreviations never end a sentence; "a.m.",
+  "p.m.", "etc." and similar do when a new capitalised sentence follows
+  (but not before a weekday or month: "3 p.m. Monday"), and initials only
+  when a common sentence opener follows;
+- blank lines and list items break; other line breaks are hard wraps.
+"""
+import re
+
+# Always followed by more of the same sentence
+TITLES = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "mt", "e.g", "i.e", "cf", "viz"}
+# May end a sentence when the next word starts a new one
+TRAILING_ABBREVIATIONS = {"a.m", "p.m", "etc", "vs", "approx", "incl", "no", "min", "mins", "hr", "hrs", "dept",
+                          "ext", "inc", "ltd", "co", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+                          "oct", "nov", "dec", "mon", "tue", "tues", "wed", "thu", "thur", "thurs", "fri", "sat",
+                          "sun"}
+# Initials and "St." usually precede a name ("J. Smith", "St. James"); they end a
+# sentence ("Hall B.", "Main St.") only before one of these common openers
+SENTENCE_OPENERS = {"the", "a", "an", "we", "i", "you", "it", "this", "there", "our", "they", "please", "if",
+                    "thanks", "thank", "see", "let"}
+# Capitalised words that usually continue a time or date rather than start a sentence
+DATE_WORDS = {"monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "mon", "tue", "tues",
+              "wed", "thu", "thur", "thurs", "fri", "sat", "sun", "january", "february", "march", "april", "may",
+              "june", "july", "august", "september", "october", "november", "december", "jan", "feb", "mar", "apr",
+              "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "est", "pst", "cet", "gmt", "utc"}
+
+_BLOCK_BREAK = re.compile(r"\n[ \t]*\n")
+_LIST_ITEM = re.compile(r"^[ \t]*(?:[-*•]|\d{1,2}[.)])[ \t]+")
+# Candidate boundary: terminal punctuation (plus closing quotes/brackets) followed by whitespace or the end
+_BOUNDARY = re.compile(r"[.!?]+['\")\]]*(?=\s|$)")
+_WORD_BEFORE = re.compile(r"([A-Za-z](?:[A-Za-z.]*[A-Za-z])?)$")
+# Longest abbreviation worth looking back for; keeps each boundary check constant-time
+_LOOKBEHIND = 8
+_WORD_AFTER = re.compile(r"\s*(\S+)")
+
+
+def _ends_sentence(text, match):
+    """Decide whether the punctuation at `match` closes a sentence."""
+    if match.group()[0] != ".":
+        return True
+
+    word = _WORD_BEFORE.search(text, max(0, match.start() - _LOOKBEHIND), match.start())
+    if word is None or (word.start() > 0 and text[word.start() - 1].isalpha()):
+        # Not a word, or the tail of a word too long to be an abbreviation
+        return True
+    word = word.group(1).lower()
+    if word in TITLES:
+        return False
+
+    following = _WORD_AFTER.match(text, match.end())
+    if following is None:
+        return True
+    following = following.group(1)
+    next_word = following.strip(".,;:!?").lower()
+    if word == "st" or (len(word) == 1 and text[match.start() - 1].isupper()):
+        return following[0].isupper() and next_word in SENTENCE_OPENERS
+    if word in TRAILING_ABBREVIATIONS:
+        return following[0].isupper() and next_word not in DATE_WORDS
+    return True
+
+
+def _finish(sentence):
+    """Collapse hard wraps and give every sentence terminal punctuation, as the old "." split did."""
+    sentence = " ".join(sentence.split())
+    if sentence and sentence[-1] not in ".!?":
+        # Lead-in lines ("Agenda:") end in a colon or comma
+        sentence = sentence.rstrip(":;,") + "."
+    return sentence
+
+
+def _split_block(block):
+    """Sentences of one paragraph of text, in order."""
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(block):
+        if _ends_sentence(block, match):
+            sentences.append(block[start:match.end()])
+            start = match.end()
+    sentences.append(block[start:])
+    return sentences
+
+
+def _blocks(text):
+    """Paragraphs and list items: the line-level units sentences never cross."""
+    for paragraph in _BLOCK_BREAK.split(text):
+        block = []
+        for line in paragraph.splitlines():
+            if _LIST_ITEM.match(line) and block:
+                yield "\n".join(block)
+                block = []
+            block.append(_LIST_ITEM.sub("", line, count=1))
+        yield "\n".join(block)
+
+
+def segment_sentences(text):
+    """Split `text` into sentences ready for parsing, skipping empty ones."""
+    sentences = []
+    for block in _blocks(text):
+        for sentence in _split_block(block):
+            sentence = _finish(sentence)
+            # Stray punctuation ("...", "--") carries nothing to extract
+            if any(char.isalnum() for char in sentence):
+                sentences.append(sentence)
+    return sentences
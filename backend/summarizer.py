@@ -0,0 +1,572 @@
+"""Text summarization backed by a single warm BART model per worker."""
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from model_registry import MODEL_LOAD_MODE, models, timed_import
+
+SUMMARIZER_MODEL = os.environ.get("SUMMARIZER_MODEL", "facebook/bart-large-cnn")
+# Smaller, faster model used when a request's deadline cannot be met with the
+# full model; set to an empty string to disable the fast tier
+SUMMARIZER_FAST_MODEL = os.environ.get("SUMMARIZER_FAST_MODEL", "sshleifer/distilbart-cnn-12-6")
+
+# Model tiers, best quality first
+SUMMARIZER_TIERS = {"bart-large": SUMMARIZER_MODEL}
+if SUMMARIZER_FAST_MODEL:
+    SUMMARIZER_TIERS["distilbart"] = SUMMARIZER_FAST_MODEL
+DEFAULT_TIER = "bart-large"
+# Beam count both CNN checkpoints use when num_beams is not overridden
+DEFAULT_NUM_BEAMS = 4
+
+# Inference backend for CPU serving:
+#   "pipeline"  - stock transformers/PyTorch model (float32)
+#   "quantized" - the same model with int8 dynamically quantized Linear layers
+#   "onnx"      - an ONNX Runtime session exported with optimum
+SUMMARIZER_BACKEND = os.environ.get("SUMMARIZER_BACKEND", "pipeline").lower()
+SUMMARIZER_BACKENDS = ("pipeline", "quantized", "onnx")
+# Where exported ONNX models are kept so each is only exported once
+SUMMARIZER_ONNX_DIR = os.environ.get("SUMMARIZER_ONNX_DIR", "onnx")
+
+# Micro-batching: requests arriving within the wait window share one generate call
+SUMMARY_BATCH_SIZE = int(os.environ.get("SUMMARY_BATCH_SIZE", "8"))
+SUMMARY_BATCH_WAIT_MS = float(os.environ.get("SUMMARY_BATCH_WAIT_MS", "15"))
+# Summary lengths are rounded up to a multiple of this many tokens; only requests
+# with the same lengths can share a generate call, so this is what lets them batch
+SUMMARY_LENGTH_STEP = int(os.environ.get("SUMMARY_LENGTH_STEP", "32"))
+
+# Inputs longer than one chunk (in model tokens) are summarized map-reduce style.
+# bart-large-cnn reads at most 1024 tokens; the rest of the budget is headroom
+# for special tokens and for pieces that tokenize slightly longer once joined
+SUMMARY_CHUNK_TOKENS = int(os.environ.get("SUMMARY_CHUNK_TOKENS", "900"))
+# How many chunks are in flight at once during the map step
+SUMMARY_FANOUT = int(os.environ.get("SUMMARY_FANOUT", "8"))
+
+# Measure each tier with a few probe generations when it loads, so deadline
+# planning starts from real numbers instead of the priors below
+SUMMARIZER_CALIBRATE = os.environ.get("SUMMARIZER_CALIBRATE", "1") == "1"
+
+# Generation runs in this many dedicated worker processes (see inference_pool.py)
+# so it never holds the web process's GIL; 0 runs it in-process instead
+SUMMARIZER_WORKERS = int(os.environ.get("SUMMARIZER_WORKERS", "1"))
+# torch thread pools per worker: intra-op parallelism inside a matmul, and
+# inter-op parallelism across independent ops (little to gain for generate)
+TORCH_INTRA_OP_THREADS = int(os.environ.get(
+    "TORCH_INTRA_OP_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, SUMMARIZER_WORKERS)))
+))
+TORCH_INTER_OP_THREADS = int(os.environ.get("TORCH_INTER_OP_THREADS", "1"))
+
+
+def load_summarizer(backend=SUMMARIZER_BACKEND, model_name=SUMMARIZER_MODEL):
+    """Build the summarization pipeline on the chosen backend (slow: loads ~1.6 GB of weights)."""
+    timed_import("transformers")
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "pipeline":
+        return pipeline("summarization", model=model_name)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == "quantized":
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        onnx_dir = os.path.join(SUMMARIZER_ONNX_DIR, model_name.replace("/", "--"))
+        if os.path.isdir(onnx_dir):
+            model = ORTModelForSeq2SeqLM.from_pretrained(onnx_dir)
+        else:
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+            model.save_pretrained(onnx_dir)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+    raise ValueError(f"Unknown SUMMARIZER_BACKEND '{backend}', expected one of {SUMMARIZER_BACKENDS}")
+
+
+def load_tokenizer():
+    """Load the summarizer's own tokenizer, used to measure and split long inputs."""
+    timed_import("transformers")
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(SUMMARIZER_MODEL)
+
+
+class LatencyModel:
+    """Predicts generate latency (ms) for one tier, refit from measured calls.
+
+    latency = intercept + per_input_token * input_tokens + per_output_step * max_length * num_beams,
+    with input and output work multiplied by the batch size.
+    """
+
+    def __init__(self, prior, max_samples=200):
+        self.coefficients = list(prior)
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def features(input_tokens, max_length, num_beams, batch_size=1):
+        return (1.0, input_tokens * batch_size, max_length * num_beams * batch_size)
+
+    def predict(self, input_tokens, max_length, num_beams, batch_size=1):
+        features = self.features(input_tokens, max_length, num_beams, batch_size)
+        return sum(weight * value for weight, value in zip(self.coefficients, features))
+
+    def record(self, input_tokens, max_length, num_beams, batch_size, elapsed_ms):
+        self.add_samples([(self.features(input_tokens, max_length, num_beams, batch_size), elapsed_ms)])
+
+    def add_samples(self, samples):
+        """Add (features, elapsed_ms) pairs, e.g. measured in another process, and refit."""
+        with self._lock:
+            self._samples.extend((tuple(features), elapsed_ms) for features, elapsed_ms in samples)
+            if len(self._samples) >= 4:
+                self._refit()
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+    def _refit(self):
+        import numpy as np
+
+        features = np.array([sample[0] for sample in self._samples])
+        latencies = np.array([sample[1] for sample in self._samples])
+        coefficients, *_ = np.linalg.lstsq(features, latencies, rcond=None)
+        # Negative costs are fitting noise; they would make long inputs look free
+        self.coefficients = [max(float(value), 0.0) for value in coefficients]
+
+
+# Rough CPU priors (ms) used until a tier has been measured
+latency_models = {
+    "bart-large": LatencyModel((300.0, 1.5, 6.0)),
+    "distilbart": LatencyModel((150.0, 0.8, 3.5)),
+}
+
+# Probe text for calibration; repeated to reach each probe's input size
+_CALIBRATION_TEXT = (
+    "The committee met on Tuesday to review the budget for the coming year and agreed to "
+    "postpone the decision on the new office until the finance team has finished its report. "
+)
+
+
+def export_latency_samples():
+    """All measured samples as (tier, features, elapsed_ms), for handing to another process."""
+    return [
+        (tier, features, elapsed_ms)
+        for tier, latency_model in latency_models.items()
+        for features, elapsed_ms in latency_model.samples()
+    ]
+
+
+def calibrate(tier, summarizer):
+    """Time a few probe generations so the tier's latency model is measured, not guessed."""
+    tokenizer = get_tokenizer()
+    probe_tokens = len(tokenizer(_CALIBRATION_TEXT, add_special_tokens=False)["input_ids"])
+    for input_tokens, max_length, num_beams in ((100, 60, 1), (400, 60, 4), (100, 120, 2), (400, 120, 1)):
+        text = _CALIBRATION_TEXT * max(1, input_tokens // probe_tokens)
+        started = time.perf_counter()
+        summarizer(text, max_length=max_length, min_length=10, num_beams=num_beams, do_sample=False)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        latency_models[tier].record(count_tokens(text), max_length, num_beams, 1, elapsed_ms)
+
+
+def _tier_loader(tier, model_name):
+    def load():
+        summarizer = load_summarizer(model_name=model_name)
+        if SUMMARIZER_CALIBRATE:
+            calibrate(tier, summarizer)
+        return summarizer
+    return load
+
+
+def load_inference_pool():
+    """Start the worker processes and adopt the latency measurements they calibrated."""
+    from inference_pool import InferencePool
+
+    pool = InferencePool(
+        SUMMARIZER_WORKERS, TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS,
+        on_broken=lambda error: models.mark_failed("inference-pool", error)
+    )
+    pool.start()
+    for tier, features, elapsed_ms in pool.latency_samples:
+        latency_models[tier].add_samples([(features, elapsed_ms)])
+    return pool
+
+
+# With a pool, the weights live in the worker processes and this process only
+# keeps the (small) tokenizer for measuring and splitting inputs
+for _tier, _model_name in SUMMARIZER_TIERS.items():
+    models.register(
+        f"summarizer:{_tier}", _tier_loader(_tier, _model_name),
+        eager=MODEL_LOAD_MODE == "eager" and SUMMARIZER_WORKERS == 0
+    )
+if SUMMARIZER_WORKERS > 0:
+    models.register("inference-pool", load_inference_pool, eager=MODEL_LOAD_MODE == "eager")
+models.register("summarizer-tokenizer", load_tokenizer, eager=MODEL_LOAD_MODE == "eager")
+
+# The pipeline's tokenizer is not safe to call from several threads at once
+_inference_lock = threading.Lock()
+
+
+def get_summarizer(tier=DEFAULT_TIER):
+    """Return the shared summarization pipeline for `tier`, loading it on first use."""
+    return models.get(f"summarizer:{tier}")
+
+
+def get_inference_pool():
+    """Return the shared worker pool, starting it on first use."""
+    return models.get("inference-pool")
+
+
+def get_tokenizer():
+    """Return the shared summarizer tokenizer, loading it on first use."""
+    return models.get("summarizer-tokenizer")
+
+
+def summary_lengths(text, length_scale=1.0):
+    """Compute (max_length, min_length) for a summary of `text`, optionally scaled down."""
+    # Calculate the lengths
+    text_length = len(text.split())  # Number of words in the text
+
+    target_length = int(text_length * 0.4 * length_scale)  # 40% of original length
+    # Nearby inputs get the same lengths, so concurrent requests can be batched together
+    step = max(1, SUMMARY_LENGTH_STEP)
+    target_length = -(-target_length // step) * step
+
+    # Set minimum and maximum lengths for summarization
+    max_length = max(target_length, 50)  # Ensure max_length is not too small
+    min_length = max(target_length // 2, 20)  # Ensure min_length is not too small
+    return max_length, min_length
+
+
+def _record_latency(texts, gen_kwargs, elapsed_ms):
+    """Feed a finished generate call to its tier's latency model."""
+    # The batch is padded to its longest input
+    latency_models[gen_kwargs.get("tier", DEFAULT_TIER)].record(
+        max(count_tokens(text) for text in texts),
+        gen_kwargs["max_length"],
+        gen_kwargs.get("num_beams", DEFAULT_NUM_BEAMS),
+        len(texts),
+        elapsed_ms
+    )
+
+
+def run_local_batch(texts, gen_kwargs):
+    """Summarize `texts` in this process with one padded, batched generate call."""
+    gen_kwargs = dict(gen_kwargs)
+    summarizer = get_summarizer(gen_kwargs.pop("tier", DEFAULT_TIER))
+    with _inference_lock:
+        started = time.perf_counter()
+        summaries = summarizer(texts, batch_size=len(texts), do_sample=False, **gen_kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    _record_latency(texts, gen_kwargs, elapsed_ms)
+    return [summary['summary_text'] for summary in summaries]
+
+
+def run_summary_batch(texts, gen_kwargs):
+    """Summarize `texts` with one batched generate call, on the worker pool when there is one."""
+    if SUMMARIZER_WORKERS == 0:
+        return run_local_batch(texts, gen_kwargs)
+
+    started = time.perf_counter()
+    summaries = get_inference_pool().run_batch(texts, gen_kwargs)
+    # Round-trip time is what callers wait for, so that is what deadline planning learns from
+    _record_latency(texts, gen_kwargs, (time.perf_counter() - started) * 1000)
+    return summaries
+
+
+class SummaryBatcher:
+    """Gathers concurrent summarize calls into batches and fans the results back out."""
+
+    def __init__(self, run_batch, max_batch_size, max_wait_ms, concurrency=1):
+        self._run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        # One batch in flight per inference worker; while all are busy, new
+        # requests keep queueing and go out together in the next batch
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+
+    def submit(self, text, **gen_kwargs):
+        """Queue `text` for summarization and return a Future for its summary."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, gen_kwargs, future))
+        return future
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._loop, name="summary-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect(self):
+        """Block for one request, then keep taking more until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        window_ends = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = window_ends - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            self._slots.acquire()
+            batch = self._collect()
+            threading.Thread(target=self._dispatch_and_release, args=(batch,), daemon=True).start()
+
+    def _dispatch_and_release(self, batch):
+        try:
+            self._dispatch(batch)
+        finally:
+            self._slots.release()
+
+    def _dispatch(self, batch):
+        # max_length/min_length apply to the whole generate call, so only
+        # requests with identical generation settings can share a batch
+        groups = {}
+        for text, gen_kwargs, future in batch:
+            key = tuple(sorted(gen_kwargs.items()))
+            groups.setdefault(key, []).append((text, future))
+
+        for key, items in groups.items():
+            try:
+                summaries = self._run_batch([text for text, _ in items], dict(key))
+            except Exception as error:
+                for _, future in items:
+                    future.set_exception(error)
+                continue
+            for (_, future), summary in zip(items, summaries):
+                future.set_result(summary)
+
+
+batcher = SummaryBatcher(run_summary_batch, SUMMARY_BATCH_SIZE, SUMMARY_BATCH_WAIT_MS, max(1, SUMMARIZER_WORKERS))
+
+
+def split_into_chunks(text, chunk_tokens=SUMMARY_CHUNK_TOKENS):
+    """Split `text` into pieces of at most `chunk_tokens` model tokens, preferring sentence boundaries."""
+    tokenizer = get_tokenizer()
+    # Keep the whitespace in front of each sentence so token counts match the joined text
+    sentences = [piece for piece in re.split(r"(?<=[.!?])(?=\s)", text) if piece.strip()]
+    if not sentences:
+        return []
+    token_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+
+    chunks = []
+    current, current_tokens = [], 0
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) > chunk_tokens:
+            # A single sentence over budget is cut on token boundaries
+            if current:
+                chunks.append("".join(current).strip())
+                current, current_tokens = [], 0
+            for start in range(0, len(ids), chunk_tokens):
+                chunks.append(tokenizer.decode(ids[start:start + chunk_tokens]).strip())
+            continue
+        if current_tokens + len(ids) > chunk_tokens:
+            chunks.append("".join(current).strip())
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += len(ids)
+    if current:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
+def count_tokens(text):
+    """Number of model tokens in `text`, excluding special tokens."""
+    return len(get_tokenizer()(text, add_special_tokens=False)["input_ids"])
+
+
+def decoding_kwargs(plan):
+    """Generation settings from a plan that do not depend on the input length."""
+    kwargs = {"tier": plan["tier"]}
+    if plan["num_beams"] is not None:
+        kwargs["num_beams"] = plan["num_beams"]
+    return kwargs
+
+
+def summarize_chunks(chunks, plan, fanout=SUMMARY_FANOUT):
+    """Map step: summarize every chunk, keeping up to `fanout` chunks in flight."""
+    # Uniform generation lengths let the batcher put the chunks in the same generate call
+    longest = max(chunks, key=lambda chunk: len(chunk.split()))
+    max_length, min_length = summary_lengths(longest, plan["length_scale"])
+    partials = []
+    for start in range(0, len(chunks), max(1, fanout)):
+        futures = [
+            batcher.submit(chunk, max_length=max_length, min_length=min_length, **decoding_kwargs(plan))
+            for chunk in chunks[start:start + fanout]
+        ]
+        partials.extend(future.result() for future in futures)
+    return partials
+
+
+def condense_to_fit(text, plan, chunk_tokens=SUMMARY_CHUNK_TOKENS, fanout=SUMMARY_FANOUT):
+    """Map rounds: replace `text` by its chunk summaries until it fits in one model call."""
+    while True:
+        chunks = split_into_chunks(text, chunk_tokens)
+        if len(chunks) <= 1:
+            break
+        reduced = " ".join(summarize_chunks(chunks, plan, fanout))
+        if len(reduced) >= len(text):
+            # The partial summaries are not getting shorter; summarize what fits
+            text = chunks[0]
+            break
+        text = reduced
+    return text
+
+
+def summarize_long_text(text, plan, chunk_tokens=SUMMARY_CHUNK_TOKENS, fanout=SUMMARY_FANOUT):
+    """Map-reduce summarization for inputs longer than the model's context window."""
+    text = condense_to_fit(text, plan, chunk_tokens, fanout)
+
+    # Reduce step: the final summary is sized relative to the text it actually reads
+    max_length, min_length = summary_lengths(text, plan["length_scale"])
+    return batcher.submit(text, max_length=max_length, min_length=min_length, **decoding_kwargs(plan)).result()
+
+
+# Plan used when the caller sets no deadline: full model, default beam search
+DEFAULT_PLAN = {"tier": DEFAULT_TIER, "num_beams": None, "length_scale": 1.0}
+
+# Candidate plans for a deadline, best quality first
+DEADLINE_PLANS = [
+    {"tier": "bart-large", "num_beams": None, "length_scale": 1.0},
+    {"tier": "bart-large", "num_beams": 2, "length_scale": 1.0},
+    {"tier": "distilbart", "num_beams": None, "length_scale": 1.0},
+    {"tier": "distilbart", "num_beams": 2, "length_scale": 1.0},
+    {"tier": "distilbart", "num_beams": 1, "length_scale": 1.0},
+    {"tier": "distilbart", "num_beams": 1, "length_scale": 0.5},
+]
+
+
+def estimate_latency_ms(input_tokens, words, plan):
+    """Predicted wall time for summarizing a text of `input_tokens` tokens and `words` words with `plan`,
+    including map-reduce rounds."""
+    latency_model = latency_models[plan["tier"]]
+    num_beams = plan["num_beams"] or DEFAULT_NUM_BEAMS
+    # Queueing in the batcher is part of what the caller waits for
+    estimate = SUMMARY_BATCH_WAIT_MS
+
+    if input_tokens > SUMMARY_CHUNK_TOKENS:
+        chunk_count = -(-input_tokens // SUMMARY_CHUNK_TOKENS)
+        wave_size = max(1, min(chunk_count, SUMMARY_FANOUT, SUMMARY_BATCH_SIZE))
+        chunk_words = int(words * SUMMARY_CHUNK_TOKENS / input_tokens)
+        max_length, _ = summary_lengths("w " * chunk_words, plan["length_scale"])
+        waves = -(-chunk_count // wave_size)
+        estimate += waves * latency_model.predict(SUMMARY_CHUNK_TOKENS, max_length, num_beams, wave_size)
+        # The reduce step reads the concatenated partial summaries
+        input_tokens = min(SUMMARY_CHUNK_TOKENS, chunk_count * max_length)
+        words = int(input_tokens * 0.75)
+
+    max_length, _ = summary_lengths("w " * words, plan["length_scale"])
+    return estimate + latency_model.predict(input_tokens, max_length, num_beams)
+
+
+def plan_summary(text, deadline_ms=None):
+    """Pick the best-quality tier and decoding settings predicted to finish within `deadline_ms`.
+
+    The plan also carries `text`'s token count, so summarizing it does not tokenize it again.
+    """
+    input_tokens = count_tokens(text)
+    if deadline_ms is None:
+        return dict(DEFAULT_PLAN, input_tokens=input_tokens)
+
+    words = len(text.split())
+    fastest = None
+    for candidate in DEADLINE_PLANS:
+        if candidate["tier"] not in SUMMARIZER_TIERS:
+            continue
+        plan = dict(candidate, input_tokens=input_tokens,
+                    predicted_ms=round(estimate_latency_ms(input_tokens, words, candidate)))
+        if plan["predicted_ms"] <= deadline_ms:
+            return plan
+        if fastest is None or plan["predicted_ms"] < fastest["predicted_ms"]:
+            fastest = plan
+    # Nothing is predicted to fit: return the quickest option rather than failing
+    return fastest
+
+
+def summarizer_id(plan):
+    """Identifies everything besides the text and lengths that shapes a summary, for cache keys."""
+    return f"{SUMMARIZER_TIERS[plan['tier']]}:{SUMMARIZER_BACKEND}:beams={plan['num_beams']}"
+
+
+def planned_tokens(text, plan):
+    """Token count of `text`, taken from its plan when plan_summary already counted it."""
+    input_tokens = plan.get("input_tokens")
+    return count_tokens(text) if input_tokens is None else input_tokens
+
+
+def summarize_text(text, plan=None):
+    plan = plan or DEFAULT_PLAN
+    if planned_tokens(text, plan) > SUMMARY_CHUNK_TOKENS:
+        return summarize_long_text(text, plan)
+
+    max_length, min_length = summary_lengths(text, plan["length_scale"])
+
+    # Generate summary (batched with any concurrent requests)
+    return batcher.submit(text, max_length=max_length, min_length=min_length, **decoding_kwargs(plan)).result()
+
+
+def stream_generation(text, tier, max_length, min_length):
+    """Yield decoded pieces of one greedy generate call in this process."""
+    import torch
+    from transformers import TextIteratorStreamer
+
+    summarizer = get_summarizer(tier)
+    tokenizer = summarizer.tokenizer
+    inputs = tokenizer(text, return_tensors="pt", truncation=True)
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+    failure = []
+
+    def generate():
+        try:
+            with _inference_lock, torch.no_grad():
+                summarizer.model.generate(
+                    **inputs, streamer=streamer, max_length=max_length, min_length=min_length,
+                    num_beams=1, do_sample=False
+                )
+        except Exception as error:
+            failure.append(error)
+            streamer.end()  # Unblock the consumer below
+
+    thread = threading.Thread(target=generate, name="summary-stream", daemon=True)
+    thread.start()
+    for piece in streamer:
+        if piece:
+            yield piece
+    thread.join()
+    if failure:
+        raise failure[0]
+
+
+def stream_summary(text, plan=None):
+    """Yield the summary of `text` piece by piece as the model decodes it.
+
+    Streaming decodes greedily (transformers cannot stream beam search), so
+    `plan["num_beams"]` is ignored. Long inputs are condensed first and only the
+    final reduce step is streamed.
+    """
+    plan = plan or DEFAULT_PLAN
+    if planned_tokens(text, plan) > SUMMARY_CHUNK_TOKENS:
+        text = condense_to_fit(text, plan)
+    max_length, min_length = summary_lengths(text, plan["length_scale"])
+
+    if SUMMARIZER_WORKERS == 0:
+        yield from stream_generation(text, plan["tier"], max_length, min_length)
+    else:
+        yield from get_inference_pool().stream(text, plan["tier"], max_length, min_length)
@@ -0,0 +1,82 @@
+"""Two-tier cache for summaries: an in-process LRU in front of a Mongo collection."""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from mongo_indexes import LazyIndexes
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_SIZE = int(os.environ.get("SUMMARY_CACHE_SIZE", "256"))
+SUMMARY_CACHE_TTL_SECONDS = int(os.environ.get("SUMMARY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def summary_cache_key(text, max_length, min_length, model):
+    """Content address for a summary: the input text plus everything that shapes the output."""
+    digest = hashlib.sha256()
+    for part in (model, str(max_length), str(min_length), text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Looks summaries up in memory, then in Mongo, and stores new ones in both."""
+
+    def __init__(self, collection, max_entries=SUMMARY_CACHE_SIZE, ttl_seconds=SUMMARY_CACHE_TTL_SECONDS):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._indexes = LazyIndexes(collection, ("created_at", {"expireAfterSeconds": ttl_seconds}))
+
+    def _remember(self, key, summary):
+        with self._lock:
+            self._memory[key] = summary
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached summary for `key`, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        try:
+            self._indexes.ensure()
+            document = self.collection.find_one({"_id": key}, {"summary": 1})
+        except Exception as error:
+            # A database outage degrades to memory-only caching rather than failing the request
+            logger.warning("Summary cache lookup failed: %s", error)
+            return None
+        if document is None:
+            return None
+        self._remember(key, document["summary"])
+        return document["summary"]
+
+    def put(self, key, summary):
+        self._remember(key, summary)
+        try:
+            self._indexes.ensure()
+            self.collection.update_one(
+                {"_id": key},
+                {"$set": {"summary": summary, "created_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as error:
+            logger.warning("Summary cache write failed: %s", error)
+
+    def get_or_compute(self, key, compute):
+        """Return (summary, cache_hit), calling `compute()` only on a miss."""
+        summary = self.get(key)
+        if summary is not None:
+            return summary, True
+        summary = compute()
+        self.put(key, summary)
+        return summary, False
@@ -0,0 +1,134 @@
+"""One precompiled grammar for the time expressions spaCy tags as TIME.
+
+Handles clock times ("3.30 p.m.", "14:00", "9 am", "5 o'clock"), phrases
+("half past three", "quarter to 4 pm", "ten to five", "noon") and ranges ("2-4pm",
+"from 9 to 11.30 a.m.", "between 1 and 2 pm"). A range missing a meridiem
+takes it from the other end, so "2-4pm" is 14:00 to 16:00 and "11-1pm" is
+11:00 to 13:00. Durations spaCy also tags as TIME ("two hours", "10 mins") are
+not clock times and pass through unchanged.
+"""
+import re
+from functools import lru_cache
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+# Minutes named before "past" or "to": "quarter past 3", "ten to five"
+_FRACTIONS = {"half": 30, "quarter": 15, "twenty five": 25, "twenty": 20, "ten": 10, "five": 5}
+_NAMED_TIMES = {"noon": 12 * 60, "midday": 12 * 60, "midnight": 0}
+_DAY_PARTS = {"morning": "a", "afternoon": "p", "evening": "p", "tonight": "p"}
+
+
+_NUMBER = r"(?:\d{1,2}(?!\d)|(?:" + "|".join(_NUMBER_WORDS) + r")\b)"
+# A number counting a duration ("two hours", "10 mins", "1.5-2 hrs") is not a clock time
+_NOT_DURATION = (
+    r"(?!(?:[.,]\d+)?(?:\s*(?:-|–|—|to|or)\s*" + _NUMBER + r"(?:[.,]\d+)?)?"
+    r"\s*(?:hours?|hrs?|minutes?|mins?|seconds?|secs?)\b)"
+)
+
+
+def _time_pattern(side):
+    """One time expression; group names are prefixed with `side` so a range can hold two."""
+    hour = _NUMBER + _NOT_DURATION
+    return (
+        rf"(?:(?P<{side}_fraction>half|quarter|twenty[\s-]?five|twenty|ten|five)[\s-]+(?P<{side}_relation>past|to)\s+(?P<{side}_fraction_hour>{hour})"
+        rf"|(?P<{side}_named>noon|midday|midnight)"
+        rf"|(?P<{side}_hour>{hour})(?:\s*[:.]\s*(?P<{side}_minute>\d{{2}})(?!\d))?(?:\s*o'?\s?clock)?)"
+        rf"(?:\s*(?P<{side}_meridiem>[ap])\.?\s?m\b\.?"
+        rf"|\s+(?:in\s+the\s+)?(?P<{side}_day_part>morning|afternoon|evening|tonight))?"
+    )
+
+
+_TIME_EXPRESSION = re.compile(
+    r"(?<![\w:.])(?P<lead>from\s+|between\s+)?" + _time_pattern("start")
+    + r"(?:\s*(?P<separator>-|–|—|to|until|till|and)\s*" + _time_pattern("end") + r")?",
+    re.IGNORECASE
+)
+
+
+def _group_names(side):
+    return {key: f"{side}_{key}" for key in
+            ("fraction", "relation", "fraction_hour", "named", "hour", "minute", "meridiem", "day_part")}
+
+
+_START, _END = _group_names("start"), _group_names("end")
+
+
+def _hour_value(text):
+    return _NUMBER_WORDS.get(text.lower()) if text.isalpha() else int(text)
+
+
+def _meridiem(groups, names):
+    meridiem = groups[names["meridiem"]]
+    if meridiem:
+        return meridiem.lower()
+    day_part = groups[names["day_part"]]
+    return _DAY_PARTS[day_part.lower()] if day_part else None
+
+
+def _minutes(groups, names, meridiem):
+    """Minutes after midnight for one side of a match, or None if it is not a valid time."""
+    named = groups[names["named"]]
+    if named:
+        return _NAMED_TIMES[named.lower()]
+
+    fraction = groups[names["fraction"]]
+    hour = _hour_value(groups[names["fraction_hour"]] if fraction else groups[names["hour"]])
+    minute = int(groups[names["minute"]] or 0)
+    if minute > 59 or hour > 23 or (meridiem and not 1 <= hour <= 12):
+        return None
+    if meridiem == "p" and hour != 12:
+        hour += 12
+    elif meridiem == "a" and hour == 12:
+        hour = 0
+
+    total = hour * 60 + minute
+    if fraction:
+        offset = _FRACTIONS[re.sub(r"[\s-]+", " ", fraction.lower())]
+        total += offset if groups[names["relation"]].lower() == "past" else -offset
+    return total % (24 * 60)
+
+
+def _format(total):
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def _resolve(match):
+    """(start, end) minutes for one match; end is None for a single time, start None if invalid."""
+    groups = match.groupdict()
+    start_meridiem = _meridiem(groups, _START)
+    separator = groups["separator"]
+    # "and" only joins a range after "between"; otherwise it lists separate times
+    if separator is None or (separator.lower() == "and" and (groups["lead"] or "").strip().lower() != "between"):
+        return _minutes(groups, _START, start_meridiem), None
+
+    end_meridiem = _meridiem(groups, _END)
+    end = _minutes(groups, _END, end_meridiem or start_meridiem)
+    start = _minutes(groups, _START, start_meridiem or end_meridiem)
+    if start is not None and end is not None and start > end and not start_meridiem and end_meridiem:
+        # "11-1pm": the start is in the other half of the day
+        start = _minutes(groups, _START, "a" if end_meridiem == "p" else "p")
+    return start, end
+
+
+@lru_cache(maxsize=4096)
+def normalize_time(text):
+    """(start, end) as "HH:MM" strings for one time expression; end is None unless it is a range.
+
+    Text with no recognisable time comes back lowercased and stripped as the start, as
+    convert_time_phrases always did, so callers never lose what spaCy tagged.
+    """
+    for match in _TIME_EXPRESSION.finditer(text):
+        start, end = _resolve(match)
+        if start is not None:
+            return _format(start), (_format(end) if end is not None else None)
+    return text.lower().strip(), None
+
+
+def normalize_times(texts):
+    """Normalize a batch of time expressions, e.g. every TIME entity in a document, in order.
+
+    Repeated expressions, common across a mailbox, are answered from a cache.
+    """
+    return [normalize_time(text) for text in texts]
@@ -3,11 +3,15 @@ import React, { useState, useEffect } from "react";
 interface FileSummarizerProps {
   text: string | null;
   onSummarize: () => void;
+  // Render the summary as it is generated. Streamed summaries are decoded
+  // greedily rather than with beam search, so they can read differently.
+  stream?: boolean;
 }
 
 const FileSummarizer: React.FC<FileSummarizerProps> = ({
   text,
   onSummarize,
+  stream = false,
 }) => {
   const [summary, setSummary] = useState<string>("");
   const [loading, setLoading] = useState<boolean>(false);
@@ -30,20 +34,79 @@ const FileSummarizer: React.FC<FileSummarizerProps> = ({
   const summarizeText = async (text: string) => {
     setLoading(true);
     try {
+      if (!stream) {
+        const response = await fetch("http://localhost:5000/summarize", {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ text }),
+        });
+
+        if (!response.ok) {
+          throw new Error("Network response was not ok.");
+        }
+
+        const result = await response.json();
+        setSummary(result.summary);
+        return;
+      }
+
+      // Ask for Server-Sent Events so the summary renders as it is generated
       const response = await fetch("http://localhost:5000/summarize", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          Accept: "text/event-stream",
         },
-        body: JSON.stringify({ text }),
+        body: JSON.stringify({ text, stream: true }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error("Network response was not ok.");
       }
 
-      const result = await response.json();
-      setSummary(result.summary);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let streamed = "";
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line; keep any partial event for the next chunk
+        const events = buffer.split("\n\n");
+        buffer = events.pop() || "";
+
+        for (const rawEvent of events) {
+          let eventName = "message";
+          let data = "";
+          for (const line of rawEvent.split("\n")) {
+            if (line.startsWith("event:")) {
+              eventName = line.slice(6).trim();
+            } else if (line.startsWith("data:")) {
+              data += line.slice(5).trim();
+            }
+          }
+          if (!data) {
+            continue;
+          }
+
+          const payload = JSON.parse(data);
+          if (eventName === "token") {
+            streamed += payload.token;
+            setSummary(streamed);
+          } else if (eventName === "done") {
+            setSummary(payload.summary);
+          } else if (eventName === "error") {
+            throw new Error(payload.error);
+          }
+        }
+      }
     } catch (error) {
       console.error("Error fetching summary:", error);
       setSummary("Error summarizing the text.");